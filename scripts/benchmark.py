@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the plotting code paths.
+
+Run with `uv run python scripts/benchmark.py <benchmark>`, see `--help` for the list.
+"""
+
+import functools
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+from unittest import mock
+
+import click
+import matplotlib
+import numpy as np
+import pandas as pd
+
+matplotlib.use("Agg")
+
+from plotting_mcp import plot  # noqa: E402
+from plotting_mcp.ingest import parse_datetime_columns  # noqa: E402
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    """Return the median wall-clock time of `fn` in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+@click.group()
+def cli() -> None:
+    """Benchmarks for the plotting code paths."""
+
+
+@cli.command("line-plot")
+@click.option("--points", default=200, help="Points per hue group (default: 200)")
+@click.option("--repeat", default=3, help="Repetitions per measurement (default: 3)")
+def line_plot(points: int, repeat: int) -> None:
+    """Compare the native line renderer with seaborn for 1 to 1000 hue groups."""
+    rng = np.random.default_rng(0)
+    print(f"{'groups':>8} {'seaborn':>10} {'native':>10} {'speedup':>8}")
+    for groups in [1, 10, 100, 1000]:
+        df = pd.DataFrame(
+            {
+                "x": np.tile(np.arange(points), groups),
+                "y": rng.normal(size=points * groups).cumsum(),
+                "group": np.repeat([f"group {i}" for i in range(groups)], points),
+            }
+        )
+        kwargs = {"x": "x", "y": "y", "hue": "group"}
+
+        native = _time(lambda: plot.plot_to_bytes(df, "line", **kwargs), repeat)  # noqa: B023
+        with mock.patch.object(plot, "_create_fast_line_plot", return_value=False):
+            seaborn = _time(lambda: plot.plot_to_bytes(df, "line", **kwargs), repeat)  # noqa: B023
+
+        print(f"{groups:>8} {seaborn:>9.3f}s {native:>9.3f}s {seaborn / native:>7.1f}x")
+
+
+@cli.command("datetime-parse")
+@click.option("--rows", default=1_000_000, help="Number of timestamps (default: 1000000)")
+@click.option("--repeat", default=3, help="Repetitions per measurement (default: 3)")
+def datetime_parse(rows: int, repeat: int) -> None:
+    """Compare parsing ISO timestamps with an inferred fixed format and per element."""
+    start = pd.Timestamp("2024-01-01")
+    offsets = pd.to_timedelta(np.arange(rows), unit="s")
+    values = pd.Series((start + offsets).strftime("%Y-%m-%dT%H:%M:%S"), dtype=object)
+
+    timings = {
+        "detect and parse (fixed format)": _time(
+            lambda: parse_datetime_columns(pd.DataFrame({"time": values})), repeat
+        ),
+        "pd.to_datetime (format='mixed')": _time(
+            lambda: pd.to_datetime(values, format="mixed"), repeat
+        ),
+    }
+
+    print(f"Parsing {rows:,} timestamps")
+    for name, seconds in timings.items():
+        print(f"{name:<34} {seconds:>8.3f}s")
+
+    # Strings are plotted as one categorical tick per timestamp, so keep this smaller
+    plot_rows = min(rows, 2_000)
+    as_strings = pd.DataFrame({"time": values[:plot_rows], "value": np.arange(plot_rows)})
+    as_dates = parse_datetime_columns(as_strings.copy())
+    kwargs = {"x": "time", "y": "value"}
+    print(f"Line plot of {plot_rows:,} timestamps")
+    for name, df in [("strings", as_strings), ("datetime64", as_dates)]:
+        seconds = _time(lambda: plot.plot_to_bytes(df, "line", **kwargs), repeat)  # noqa: B023
+        print(f"{name:<34} {seconds:>8.3f}s")
+
+
+@cli.command("aggregating-plots")
+@click.option("--repeat", default=3, help="Repetitions per measurement (default: 3)")
+def aggregating_plots(repeat: int) -> None:
+    """Compare the histogram and box plot types with seaborn for 10k to 1M rows."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    def seaborn_plot(draw: Callable[..., object], df: pd.DataFrame, **kwargs) -> None:
+        fig, ax = plt.subplots()
+        draw(data=df, ax=ax, **kwargs)
+        fig.savefig(io.BytesIO(), format="png")
+        plt.close(fig)
+
+    rng = np.random.default_rng(0)
+    print(f"{'plot':<10} {'rows':>10} {'seaborn':>10} {'native':>10} {'speedup':>8}")
+    for rows in [10_000, 100_000, 1_000_000]:
+        df = pd.DataFrame(
+            {"group": rng.choice(list("abcde"), size=rows), "value": rng.normal(size=rows)}
+        )
+        cases = [
+            ("histogram", sns.histplot, {"x": "value", "bins": 30}),
+            ("box", sns.boxplot, {"x": "group", "y": "value"}),
+        ]
+        for plot_type, draw, kwargs in cases:
+            native = _time(lambda: plot.plot_to_bytes(df, plot_type, **kwargs), repeat)  # noqa: B023
+            seaborn = _time(lambda: seaborn_plot(draw, df, **kwargs), repeat)  # noqa: B023
+            print(
+                f"{plot_type:<10} {rows:>10,} {seaborn:>9.3f}s {native:>9.3f}s "
+                f"{seaborn / native:>7.1f}x"
+            )
+
+
+# Run in a fresh interpreter, prints the peak RSS of parsing and plotting the CSV data
+_PEAK_RSS_SCRIPT = """
+import io, json, sys, time
+import numpy as np, pandas as pd
+from plotting_mcp import ingest, plot
+
+plot_type, mode, rows = sys.argv[1], sys.argv[2], int(sys.argv[3])
+rng = np.random.default_rng(0)
+labels = np.array([f"category {i}" for i in range(20)])
+if plot_type == "bar":
+    df = pd.DataFrame({
+        "category": labels[rng.integers(0, 20, rows)],
+        "group": np.array(["first", "second", "third"])[rng.integers(0, 3, rows)],
+        "value": rng.integers(0, 1000, rows),
+    })
+    kwargs = {"x": "category", "y": "value", "hue": "group", "errorbar": None}
+else:
+    df = pd.DataFrame({"browser": labels[rng.integers(0, 10, rows)]})
+    kwargs = {}
+csv_data = df.to_csv(index=False)
+del df
+
+def rss_kib(field):
+    status = open("/proc/self/status").read()
+    return int(status.split(field + ":")[1].split()[0])
+
+# Reset the peak to the current RSS, so only parsing and plotting count
+open("/proc/self/clear_refs", "w").write("5")
+baseline = rss_kib("VmRSS")
+start = time.perf_counter()
+if mode == "compact":
+    parsed = ingest.read_csv(csv_data)
+else:
+    parsed = pd.read_csv(io.StringIO(csv_data))
+data_bytes = int(parsed.memory_usage(deep=True).sum())
+plot.plot_to_bytes(ingest.prepare_dataframe(parsed, plot_type), plot_type, **kwargs)
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "data_bytes": data_bytes,
+    "peak_bytes": (rss_kib("VmHWM") - baseline) * 1024,
+}))
+"""
+
+
+@cli.command("compaction")
+@click.option("--rows", default=1_000_000, help="Number of data rows (default: 1000000)")
+def compaction(rows: int) -> None:
+    """Compare memory and time of bar and pie plots with and without compaction (Linux)."""
+    print(f"{'plot':<6} {'parse':<8} {'data':>10} {'peak RSS':>10} {'time':>8}")
+    for plot_type in ["bar", "pie"]:
+        for mode in ["default", "compact"]:
+            result = subprocess.run(
+                [sys.executable, "-c", _PEAK_RSS_SCRIPT, plot_type, mode, str(rows)],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            run = json.loads(result.stdout.strip().splitlines()[-1])
+            print(
+                f"{plot_type:<6} {mode:<8} {run['data_bytes'] / 2**20:>8.1f}Mi "
+                f"{run['peak_bytes'] / 2**20:>8.1f}Mi {run['seconds']:>7.2f}s"
+            )
+
+
+# Run in a fresh interpreter per scale, prints the memory of its feature indices
+_FEATURE_INDEX_SCRIPT = """
+import json, sys
+from plotting_mcp import plot
+
+def rss_bytes():
+    return int(open("/proc/self/statm").read().split()[1]) * 4096
+
+# The first load also imports the shapefile reader, which is not index memory
+plot._load_feature_index("physical", "coastline", "110m")
+plot.feature_indices.clear()
+scale = sys.argv[1]
+baseline = rss_bytes()
+for category, name, _ in plot.MAP_FEATURES:
+    plot._load_feature_index(category, name, scale)
+print(json.dumps({"resident": rss_bytes() - baseline, "estimated": plot.feature_indices.nbytes}))
+"""
+
+
+@cli.command("feature-indices")
+def feature_indices() -> None:
+    """Compare the resident and estimated memory of the map feature indices (Linux)."""
+    print(f"{'scale':<6} {'resident':>10} {'estimated':>10}")
+    for scale in ["110m", "50m", "10m"]:
+        result = subprocess.run(
+            [sys.executable, "-c", _FEATURE_INDEX_SCRIPT, scale],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        run = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f"{scale:<6} {run['resident'] / 2**20:>8.1f}Mi {run['estimated'] / 2**20:>8.1f}Mi")
+
+
+# Run in a fresh interpreter, prints the seconds until ready and for the first plot
+_FIRST_PLOT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from plotting_mcp import server
+from plotting_mcp.warmup import warm_up
+if sys.argv[1] == "warm-up":
+    warm_up(server.scheduler)
+ready = time.perf_counter()
+server.generate_plot("x,y\\n1,2\\n2,3\\n3,1", "line", '{"x": "x", "y": "y"}')
+print(json.dumps({"ready": ready - start, "first_plot": time.perf_counter() - ready}))
+"""
+
+
+@cli.command("time-to-first-plot")
+@click.option("--repeat", default=3, help="Repetitions per measurement (default: 3)")
+def time_to_first_plot(repeat: int) -> None:
+    """Compare time to the first plot on a fresh volume, with a baked cache and warm-up."""
+    scripts = Path(__file__).parent
+    with tempfile.TemporaryDirectory() as tmp:
+        baked = Path(tmp) / "baked"
+        subprocess.run(
+            [sys.executable, str(scripts / "build_matplotlib_cache.py")],
+            env={**os.environ, "MPLCONFIGDIR": str(baked)},
+            check=True,
+            capture_output=True,
+        )
+
+        print(f"{'start':<26} {'ready':>8} {'first plot':>11} {'total':>8}")
+        scenarios = [
+            ("fresh volume", "", "none"),
+            ("baked cache", str(baked), "none"),
+            ("baked cache and warm-up", str(baked), "warm-up"),
+        ]
+        for name, seed_dir, mode in scenarios:
+            runs = []
+            for i in range(repeat):
+                # Every run starts with an empty MPLCONFIGDIR, like a pod on a new volume
+                env = {
+                    **os.environ,
+                    "MPLCONFIGDIR": str(Path(tmp) / f"{mode}-{bool(seed_dir)}-{i}"),
+                    "MPL_CACHE_SEED_DIR": seed_dir,
+                }
+                result = subprocess.run(
+                    [sys.executable, "-c", _FIRST_PLOT_SCRIPT, mode],
+                    env=env,
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+                runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+            ready = statistics.median(run["ready"] for run in runs)
+            first_plot = statistics.median(run["first_plot"] for run in runs)
+            total = statistics.median(run["ready"] + run["first_plot"] for run in runs)
+            print(f"{name:<26} {ready:>7.3f}s {first_plot:>10.3f}s {total:>7.3f}s")
+
+
+@cli.command("isolation")
+@click.option("--repeat", default=5, help="Repetitions per measurement (default: 5)")
+def isolation(repeat: int) -> None:
+    """
+    Compare rendering in process with rendering in a child process with limits.
+
+    Set PLOT_WARMUP=true to measure children of a warmed-up fork server.
+    """
+    from plotting_mcp import server
+    from plotting_mcp.configure_logging import configure_logging
+    from plotting_mcp.isolation import run_isolated
+
+    configure_logging(log_level="WARNING")
+    start = time.perf_counter()
+    run_isolated(len, "")
+    print(f"Fork server start: {time.perf_counter() - start:.3f}s")
+    print(f"Empty isolated call: {_time(lambda: run_isolated(len, ''), repeat) * 1000:.1f}ms\n")
+
+    rng = np.random.default_rng(0)
+    print(f"{'plot':<10} {'rows':>8} {'in process':>11} {'isolated':>10} {'overhead':>10}")
+    for rows in [100, 10_000, 100_000]:
+        csv_data = pd.DataFrame(
+            {
+                "row": np.arange(rows),
+                "group": rng.choice(list("abcde"), size=rows),
+                "value": rng.normal(size=rows),
+                "lat": rng.uniform(-60, 70, size=rows),
+                "lon": rng.uniform(-180, 180, size=rows),
+            }
+        ).to_csv(index=False)
+        cases = [
+            ("line", {"x": "row", "y": "value", "hue": "group"}),
+            ("bar", {"x": "group", "y": "value"}),
+            ("histogram", {"x": "value"}),
+            ("worldmap", {}),
+        ]
+        for plot_type, kwargs in cases:
+            render = functools.partial(
+                server.generate_plot, csv_data, plot_type, json.dumps(kwargs)
+            )
+            render()
+            in_process = _time(render, repeat)
+            with mock.patch.object(server, "PLOT_ISOLATION", True):
+                isolated = _time(render, repeat)
+            print(
+                f"{plot_type:<10} {rows:>8,} {in_process:>10.3f}s {isolated:>9.3f}s "
+                f"{(isolated - in_process) * 1000:>8.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Build the matplotlib font cache during Docker build to avoid rebuilding it at runtime.
+
+Writes the cache into `MPLCONFIGDIR`, which the image then ships read-only and copies
+to the runtime `MPLCONFIGDIR` on start (see `MPL_CACHE_SEED_DIR`).
+"""
+
+import os
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from matplotlib import font_manager  # noqa: E402
+
+
+def build_matplotlib_cache():
+    """Build the font list and check that it resolves the fonts used for plotting."""
+    print(f"Building matplotlib cache in {matplotlib.get_cachedir()}...")
+    if not os.getenv("MPLCONFIGDIR"):
+        print("- Warning: MPLCONFIGDIR is not set, building the default cache")
+
+    # Importing font_manager builds the font list, finding a font makes sure it is usable
+    for family in matplotlib.rcParams["font.sans-serif"][:1]:
+        print(f"- Resolving {family}: {font_manager.findfont(family)}")
+
+    for path in sorted(Path(matplotlib.get_cachedir()).iterdir()):
+        print(f"- {path.name}")
+    print("Matplotlib cache built successfully!")
+
+
+if __name__ == "__main__":
+    build_matplotlib_cache()
@@ -3,41 +3,27 @@
 Pre-download Cartopy map data during Docker build to avoid runtime downloads.
 """
 
-import cartopy.crs as ccrs
-import cartopy.feature as cfeature
-import matplotlib.pyplot as plt
-from cartopy.mpl.geoaxes import GeoAxes
+from cartopy.io import shapereader
+
+# Keep in sync with `MAP_FEATURES` in `plotting_mcp.plot`. World maps pick the scale
+# from the extent of the plotted points, so every scale is needed.
+FEATURES = [
+    ("physical", "ocean"),
+    ("physical", "land"),
+    ("physical", "coastline"),
+    ("cultural", "admin_0_boundary_lines_land"),
+]
+SCALES = ["110m", "50m", "10m"]
 
 
 def download_cartopy_features():
     """Download all Cartopy features used in the plotting code."""
     print("Downloading Cartopy map data...")
 
-    # Create a temporary figure to trigger feature downloads
-    fig = plt.figure(figsize=(10, 8))
-    ax: GeoAxes = fig.add_subplot(1, 1, 1, projection=ccrs.PlateCarree())  # ty: ignore[invalid-assignment]
-
-    # Add all features used in the plotting code
-    print("- Downloading COASTLINE...")
-    ax.add_feature(cfeature.COASTLINE)
-
-    print("- Downloading BORDERS...")
-    ax.add_feature(cfeature.BORDERS)
-
-    print("- Downloading OCEAN...")
-    ax.add_feature(cfeature.OCEAN)
-
-    print("- Downloading LAND...")
-    ax.add_feature(cfeature.LAND)
-
-    # Set global extent to ensure all data is downloaded
-    ax.set_global()
-
-    # Force rendering to trigger downloads
-    fig.canvas.draw()
-
-    # Clean up
-    plt.close(fig)
+    for scale in SCALES:
+        for category, name in FEATURES:
+            print(f"- Downloading {name.upper()} ({scale})...")
+            shapereader.natural_earth(resolution=scale, category=category, name=name)
 
     print("Cartopy map data downloaded successfully!")
 
@@ -0,0 +1,4 @@
+from plotting_mcp.mpl_cache import seed_matplotlib_cache
+
+# Before any module imports matplotlib and loads (or rebuilds) its font list
+seed_matplotlib_cache()
@@ -0,0 +1,174 @@
+"""
+Summaries computed for the aggregating plot types (histogram, heatmap, box).
+
+Columns are processed in fixed-size chunks, so the temporary arrays stay the same size
+however many rows there are, and only the summary (one value per bin or box) is drawn.
+"""
+
+from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+# Rows processed at once, bounding the temporaries of the NumPy binning functions
+_CHUNK_ROWS = 65_536
+
+# Outliers drawn per box at most. Beyond that, evenly spaced ones (including the most
+# extreme) are kept so that drawing does not grow with the number of rows.
+_MAX_FLIERS = 200
+
+# Quartiles and the median, as fractions
+_BOX_QUANTILES = (0.25, 0.5, 0.75)
+
+
+def numeric_values(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Return a column as a NumPy array, raising ValueError unless it is numeric."""
+    if column not in df.columns:
+        raise ValueError(f"Column '{column}' not found. Available columns: {list(df.columns)}")
+    if not pd.api.types.is_numeric_dtype(df[column]):
+        raise ValueError(f"Column '{column}' must be numeric to be aggregated")
+    values = df[column]
+    # Booleans do not support the arithmetic of binning, nullable types are not NumPy
+    if pd.api.types.is_bool_dtype(values) or isinstance(
+        values.dtype, pd.api.extensions.ExtensionDtype
+    ):
+        return values.to_numpy(dtype=float)
+    return values.to_numpy()
+
+
+def _chunks(values: np.ndarray, chunk_rows: int = _CHUNK_ROWS) -> Iterator[np.ndarray]:
+    for start in range(0, len(values), chunk_rows):
+        yield values[start : start + chunk_rows]
+
+
+def _value_range(values: np.ndarray, chunk_rows: int = _CHUNK_ROWS) -> tuple[float, float]:
+    """Minimum and maximum of the values, widened like NumPy when they are equal."""
+    low = min(float(np.min(chunk)) for chunk in _chunks(values, chunk_rows))
+    high = max(float(np.max(chunk)) for chunk in _chunks(values, chunk_rows))
+    if not (np.isfinite(low) and np.isfinite(high)):
+        raise ValueError("Cannot aggregate infinite values")
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return low, high
+
+
+def histogram(
+    values: np.ndarray,
+    bins: int,
+    value_range: tuple[float, float] | None = None,
+    chunk_rows: int = _CHUNK_ROWS,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Count values in equal-width bins, like `np.histogram` with an integer `bins`.
+
+    Returns the counts and the bin edges. Values outside `value_range` are not counted.
+    """
+    if value_range is None:
+        value_range = _value_range(values, chunk_rows)
+    counts = np.zeros(bins, dtype=np.int64)
+    for chunk in _chunks(values, chunk_rows):
+        counts += np.histogram(chunk, bins=bins, range=value_range)[0]
+    return counts, np.linspace(value_range[0], value_range[1], bins + 1)
+
+
+def histogram2d(
+    x: np.ndarray,
+    y: np.ndarray,
+    bins: tuple[int, int],
+    chunk_rows: int = _CHUNK_ROWS,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count (x, y) pairs in a grid of equal-width bins, like `np.histogram2d`.
+
+    Returns the counts indexed by [x bin, y bin] and the x and y bin edges.
+    """
+    value_range = (_value_range(x, chunk_rows), _value_range(y, chunk_rows))
+    counts = np.zeros(bins, dtype=np.int64)
+    for x_chunk, y_chunk in zip(_chunks(x, chunk_rows), _chunks(y, chunk_rows), strict=True):
+        counts += np.histogram2d(x_chunk, y_chunk, bins=bins, range=value_range)[0].astype(np.int64)
+    x_edges = np.linspace(*value_range[0], bins[0] + 1)
+    y_edges = np.linspace(*value_range[1], bins[1] + 1)
+    return counts, x_edges, y_edges
+
+
+def quantiles(values: np.ndarray, qs: tuple[float, ...]) -> np.ndarray:
+    """
+    Compute quantiles with linear interpolation, like `np.quantile`.
+
+    Uses a partial sort (`np.partition`) around the needed ranks instead of sorting.
+    """
+    positions = (len(values) - 1) * np.asarray(qs)
+    lower = np.floor(positions).astype(int)
+    upper = np.ceil(positions).astype(int)
+    partitioned = np.partition(values, np.unique(np.concatenate([lower, upper])))
+    low, high = partitioned[lower].astype(float), partitioned[upper].astype(float)
+    return low + (positions - lower) * (high - low)
+
+
+@dataclass(frozen=True)
+class BoxStats:
+    """Summary drawn as one box, in the format of `Axes.bxp`."""
+
+    label: str
+    q1: float
+    med: float
+    q3: float
+    whislo: float
+    whishi: float
+    fliers: np.ndarray
+
+    def as_bxp(self) -> dict:
+        return {
+            "label": self.label,
+            "q1": self.q1,
+            "med": self.med,
+            "q3": self.q3,
+            "whislo": self.whislo,
+            "whishi": self.whishi,
+            "fliers": self.fliers,
+        }
+
+
+def box_stats(values: np.ndarray, label: str = "", whis: float = 1.5) -> BoxStats:
+    """
+    Summarize values as quartiles, whiskers and outliers, like `sns.boxplot`.
+
+    Whiskers extend to the furthest values within `whis` times the interquartile range
+    of the box.
+    """
+    q1, med, q3 = quantiles(values, _BOX_QUANTILES)
+    low_limit, high_limit = q1 - whis * (q3 - q1), q3 + whis * (q3 - q1)
+    inside = (values >= low_limit) & (values <= high_limit)
+
+    fliers = np.sort(values[~inside])
+    if len(fliers) > _MAX_FLIERS:
+        fliers = fliers[np.linspace(0, len(fliers) - 1, _MAX_FLIERS).round().astype(int)]
+    return BoxStats(
+        label=label,
+        q1=q1,
+        med=med,
+        q3=q3,
+        whislo=float(np.min(values[inside])),
+        whishi=float(np.max(values[inside])),
+        fliers=fliers,
+    )
+
+
+def grouped_box_stats(values: np.ndarray, groups: pd.Series | None = None) -> list[BoxStats]:
+    """
+    Summarize values per group, in order of appearance like seaborn.
+
+    Without groups, a single unlabeled box is returned.
+    """
+    if groups is None:
+        return [box_stats(values)]
+
+    codes, levels = pd.factorize(groups, sort=False)
+    # One stable sort by group, then each group is a contiguous slice
+    order = np.argsort(codes, kind="stable")
+    boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+    return [
+        box_stats(group_values, label=str(level))
+        for level, group_values in zip(levels, np.split(values[order], boundaries), strict=True)
+    ]
@@ -0,0 +1,58 @@
+"""Cache of parsed plot data, so follow-up renders don't need the CSV again."""
+
+import threading
+import uuid
+from collections import OrderedDict
+
+import pandas as pd
+
+from plotting_mcp.constants import PLOT_CACHE_MAX_MB, PLOT_CACHE_SIZE
+
+
+class DataFrameCache:
+    """Thread-safe LRU cache of DataFrames, bounded by entry count and memory usage."""
+
+    def __init__(
+        self, max_entries: int = PLOT_CACHE_SIZE, max_bytes: int = PLOT_CACHE_MAX_MB * 1024 * 1024
+    ) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[pd.DataFrame, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the stored DataFrames."""
+        return self._bytes
+
+    def put(self, df: pd.DataFrame) -> str | None:
+        """
+        Store a DataFrame and return its handle.
+
+        Returns None if the DataFrame alone is larger than the cache.
+        """
+        nbytes = int(df.memory_usage(deep=True).sum())
+        if nbytes > self._max_bytes or self._max_entries < 1:
+            return None
+
+        handle = uuid.uuid4().hex
+        with self._lock:
+            self._entries[handle] = (df, nbytes)
+            self._bytes += nbytes
+            while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+        return handle
+
+    def get(self, handle: str) -> pd.DataFrame | None:
+        """Return the DataFrame stored under `handle`, or None if unknown or evicted."""
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                return None
+            self._entries.move_to_end(handle)
+            return entry[0]
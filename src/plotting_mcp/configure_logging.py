@@ -1,25 +1,176 @@
+import atexit
 import logging.config
-from typing import Dict
+import queue
+import threading
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Literal
 
 import structlog
 
+from plotting_mcp.constants import LOG_MAX_FIELD_LENGTH, LOG_SAMPLE_RATES
 
-def configure_logging(log_level: str = "INFO") -> Dict:
-    logging_level = getattr(logging, log_level.upper(), logging.INFO)
+LogFormat = Literal["console", "json"]
+
+# Listener writing the records queued by the JSON handler, see `queue_handler`
+_listener: QueueListener | None = None
+
+
+def _shared_processors(timestamper) -> list:
     # Full list of processors can be found at:
     # https://www.structlog.org/en/stable/api.html#module-structlog.processors
-    shared_processors = [
+    return [
         structlog.stdlib.add_log_level,
         structlog.stdlib.add_logger_name,
-        # Timestamp format
-        structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S", utc=True),
+        timestamper,
         # If some value is in bytes, decode it to a Unicode str.
         structlog.processors.UnicodeDecoder(),
     ]
 
+
+def _add_record_timestamp(logger, method_name: str, event_dict: Dict) -> Dict:
+    """Timestamp foreign records with their creation time instead of their formatting time."""
+    created = datetime.fromtimestamp(event_dict["_record"].created, tz=UTC)
+    event_dict["timestamp"] = created.isoformat().replace("+00:00", "Z")
+    return event_dict
+
+
+class FieldTruncator:
+    """Structlog processor truncating the rendered value of oversized fields."""
+
+    def __init__(self, max_length: int = LOG_MAX_FIELD_LENGTH) -> None:
+        self.max_length = max_length
+
+    def __call__(self, logger, method_name: str, event_dict: Dict) -> Dict:
+        for key, value in event_dict.items():
+            # Tracebacks are only logged on errors and are useless when cut short
+            if key == "exception" or value is None or isinstance(value, (bool, int, float)):
+                continue
+            text = value if isinstance(value, str) else repr(value)
+            if len(text) > self.max_length:
+                event_dict[key] = f"{text[: self.max_length]}... ({len(text)} chars)"
+        return event_dict
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of the records emitted by selected loggers.
+
+    Rates apply to a logger and its children, e.g. a rate of 0.1 for `uvicorn.access`
+    keeps one record in ten. Records at WARNING and above are always kept.
+    """
+
+    def __init__(self, rates: Dict[str, float]) -> None:
+        super().__init__()
+        self._rates = rates
+        # Start with full credit so the first record of every logger is kept
+        self._credit = dict.fromkeys(rates, 1.0)
+        self._lock = threading.Lock()
+
+    def _sampled_logger(self, name: str) -> str | None:
+        while name:
+            if name in self._rates:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        sampled = self._sampled_logger(record.name)
+        if sampled is None:
+            return True
+        with self._lock:
+            credit = self._credit[sampled]
+            if credit >= 1.0:
+                self._credit[sampled] = credit - 1.0 + self._rates[sampled]
+                return True
+            self._credit[sampled] = credit + self._rates[sampled]
+            return False
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """Parse sample rates given as `logger=rate` pairs separated by commas."""
+    rates = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, sep, rate = item.partition("=")
+        if not sep or not 0.0 <= float(rate) <= 1.0:
+            raise ValueError(f"Invalid log sample rate {item!r}, expected <logger>=<0..1>")
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues records untouched.
+
+    The standard handler formats records before enqueuing them, which would both keep
+    formatting on the caller's thread and flatten structlog's event dicts to strings.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
+def queue_handler() -> QueueHandler:
+    """
+    Create a handler writing JSON logs to stderr from a background thread.
+
+    Used as a `dictConfig` factory. The configuration may be applied more than once
+    (uvicorn applies it again on start), so the previous listener is flushed and
+    stopped first.
+    """
+    global _listener
+    _stop_listener()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        structlog.stdlib.ProcessorFormatter(
+            processors=[
+                structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                structlog.processors.format_exc_info,
+                FieldTruncator(),
+                structlog.processors.JSONRenderer(),
+            ],
+            # Foreign (non-structlog) records only go through this chain once dequeued
+            foreign_pre_chain=_shared_processors(_add_record_timestamp),
+        )
+    )
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+    return _DeferredQueueHandler(log_queue)
+
+
+def configure_logging(log_level: str = "INFO", log_format: LogFormat = "console") -> Dict:
+    logging_level = getattr(logging, log_level.upper(), logging.INFO)
+    if log_format == "json":
+        shared_processors = _shared_processors(structlog.processors.TimeStamper(fmt="iso"))
+        # Exceptions must be captured on the logging thread, the listener has no
+        # current exception to format
+        structlog_processors = shared_processors + [structlog.processors.format_exc_info]
+    else:
+        # Timestamp format
+        shared_processors = _shared_processors(
+            structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S", utc=True)
+        )
+        structlog_processors = shared_processors
+
     # Configuration for structlog. Shared processors and prepare structlog for the `formatter`
     structlog.configure(
-        processors=shared_processors
+        processors=structlog_processors
         + [
             structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
@@ -28,12 +179,32 @@ def configure_logging(log_level: str = "INFO") -> Dict:
         cache_logger_on_first_use=True,
     )
 
+    if log_format == "json":
+        # Formatting and writing happen on the queue listener's thread
+        default_handler = {
+            "()": queue_handler,
+            "level": logging_level,
+            "filters": ["sampling"],
+        }
+    else:
+        default_handler = {
+            "level": logging_level,
+            "class": "logging.StreamHandler",
+            "formatter": "colored",
+        }
+
     # Capture warnings and redirect them to the logging system.
     logging.captureWarnings(True)
     # Configuration for the standard library logging module.
     logging_dict = {
         "version": 1,
         "disable_existing_loggers": False,
+        "filters": {
+            "sampling": {
+                "()": SamplingFilter,
+                "rates": parse_sample_rates(LOG_SAMPLE_RATES),
+            },
+        },
         "formatters": {
             "colored": {
                 "()": structlog.stdlib.ProcessorFormatter,
@@ -48,11 +219,7 @@ def configure_logging(log_level: str = "INFO") -> Dict:
             },
         },
         "handlers": {
-            "default": {
-                "level": logging_level,
-                "class": "logging.StreamHandler",
-                "formatter": "colored",
-            },
+            "default": default_handler,
         },
         "loggers": {
             "": {
@@ -8,5 +8,49 @@ PLOT_HEIGHT = int(os.getenv("PLOT_HEIGHT", 6))
 PLOT_FIGURE_SIZE = (PLOT_WIDTH, PLOT_HEIGHT)
 PLOT_DPI = int(os.getenv("PLOT_DPI", 100))
 
+# Constants for preview renders and the cache of their parsed data
+PLOT_PREVIEW_DPI = int(os.getenv("PLOT_PREVIEW_DPI", 50))
+PLOT_PREVIEW_MAX_ROWS = int(os.getenv("PLOT_PREVIEW_MAX_ROWS", 2_000))
+PLOT_CACHE_SIZE = int(os.getenv("PLOT_CACHE_SIZE", 8))
+PLOT_CACHE_MAX_MB = int(os.getenv("PLOT_CACHE_MAX_MB", 16))
+
+# Constants for admission control and scheduling of plot requests
+PLOT_MEMORY_BUDGET_MB = int(os.getenv("PLOT_MEMORY_BUDGET_MB", 64))
+PLOT_FAST_LANE_MAX_COST = int(os.getenv("PLOT_FAST_LANE_MAX_COST", 100_000))
+# Pyplot keeps global state, so renders are serialized unless explicitly allowed
+PLOT_MAX_CONCURRENT_RENDERS = int(os.getenv("PLOT_MAX_CONCURRENT_RENDERS", 1))
+# Slow lane requests waiting longer than this start ahead of the fast lane
+PLOT_SLOW_LANE_MAX_WAIT_SECONDS = float(os.getenv("PLOT_SLOW_LANE_MAX_WAIT_SECONDS", 30.0))
+
+# Constants for isolating each render in a child process with resource limits
+PLOT_ISOLATION = os.getenv("PLOT_ISOLATION", "false").lower() in ("1", "true", "yes")
+# Address space (RLIMIT_AS) of a render process, including the loaded libraries
+PLOT_ISOLATION_MEMORY_MB = int(os.getenv("PLOT_ISOLATION_MEMORY_MB", 1024))
+PLOT_ISOLATION_CPU_SECONDS = int(os.getenv("PLOT_ISOLATION_CPU_SECONDS", 30))
+PLOT_ISOLATION_TIMEOUT_SECONDS = float(os.getenv("PLOT_ISOLATION_TIMEOUT_SECONDS", 60.0))
+
+# Constants for the readiness check at /ready, which fails above any of the thresholds
+# Requests finished within this many seconds count towards the latency percentile.
+# Older ones expire, so a server marked unready for its latency recovers once idle.
+PLOT_LATENCY_WINDOW_SECONDS = float(os.getenv("PLOT_LATENCY_WINDOW_SECONDS", 60.0))
+PLOT_READY_MAX_QUEUE_DEPTH = int(os.getenv("PLOT_READY_MAX_QUEUE_DEPTH", 4))
+PLOT_READY_MAX_P95_SECONDS = float(os.getenv("PLOT_READY_MAX_P95_SECONDS", 20.0))
+PLOT_READY_MAX_RENDER_SECONDS = float(os.getenv("PLOT_READY_MAX_RENDER_SECONDS", 30.0))
+PLOT_READY_MIN_MEMORY_HEADROOM_MB = int(os.getenv("PLOT_READY_MIN_MEMORY_HEADROOM_MB", 16))
+# Memory limit of the server, 0 to read it from the container's cgroup
+PLOT_MEMORY_LIMIT_MB = int(os.getenv("PLOT_MEMORY_LIMIT_MB", 0))
+
+# Constants for production (JSON) logging
+# Longer field values are truncated, e.g. the plot kwargs of each request
+LOG_MAX_FIELD_LENGTH = int(os.getenv("LOG_MAX_FIELD_LENGTH", 1000))
+# Comma-separated `logger=rate` pairs, e.g. "uvicorn.access=0.1"
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+# Constants for server start
+# Read-only matplotlib cache baked into the image, copied into MPLCONFIGDIR on start
+MPL_CACHE_SEED_DIR = os.getenv("MPL_CACHE_SEED_DIR", "")
+# Render one throwaway plot of each type before /ready reports ready
+PLOT_WARMUP = os.getenv("PLOT_WARMUP", "false").lower() in ("1", "true", "yes")
+
 # Constants for server configuration
 MCP_PORT = os.getenv("MCP_PORT", 9090)
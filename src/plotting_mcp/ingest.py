@@ -0,0 +1,230 @@
+"""Parsing of CSV data into DataFrames ready for plotting."""
+
+import io
+import math
+import re
+import sys
+from typing import Callable, Hashable
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+# Plot types with a continuous x-axis, where timestamps are best plotted as dates.
+# Categorical plots (bar, pie) keep the original strings as labels.
+DATETIME_PLOT_TYPES = {"line"}
+
+# Number of values inspected per column when looking for timestamps
+_DATETIME_SAMPLE_SIZE = 20
+
+# String columns with at most this share of distinct values are stored as categories
+_CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Rows parsed up front to find the string columns to parse as categories
+_SNIFF_ROWS = 1_000
+
+_ISO_DATETIME = re.compile(
+    r"^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?(Z|[+-]\d{2}:?\d{2})?$"
+)
+
+
+def _infer_datetime_format(values: pd.Series) -> str | None:
+    """
+    Infer the timestamp format of a column from a sample of its values.
+
+    Returns None unless every sampled value is an ISO 8601 date or timestamp in the
+    same format.
+    """
+    positions = np.unique(np.linspace(0, len(values) - 1, _DATETIME_SAMPLE_SIZE, dtype=int))
+    samples = values.iloc[positions].tolist()
+    if not all(isinstance(value, str) and _ISO_DATETIME.match(value) for value in samples):
+        return None
+
+    datetime_format = guess_datetime_format(samples[0])
+    if datetime_format is None:
+        return None
+    try:
+        pd.to_datetime(samples, format=datetime_format, utc="%z" in datetime_format)
+    except (ValueError, TypeError):
+        return None
+    return datetime_format
+
+
+def _is_text(values: pd.Series) -> bool:
+    return values.dtype == object or isinstance(values.dtype, pd.StringDtype)
+
+
+def _parse_datetime_categories(values: pd.Series) -> pd.Series | None:
+    """Parse a categorical column of timestamps once per distinct value."""
+    categories = pd.Series(values.cat.categories)
+    if not _is_text(categories) or categories.empty:
+        return None
+    datetime_format = _infer_datetime_format(categories)
+    if datetime_format is None:
+        return None
+    try:
+        parsed = pd.to_datetime(
+            values.cat.categories, format=datetime_format, utc="%z" in datetime_format
+        )
+        renamed = values.cat.rename_categories(parsed)
+        # Plotted as dates on a continuous axis, not as categories
+        return renamed.astype(renamed.cat.categories.dtype)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_datetime_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert string columns holding timestamps to datetime64.
+
+    The format is inferred once per column from a sample, then the whole column is
+    parsed with that fixed format. Columns whose values do not all follow it are left
+    unchanged. Categorical columns are parsed once per category.
+    """
+    for col in df.columns:
+        values = df[col]
+        if values.empty:
+            continue
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            parsed = _parse_datetime_categories(values)
+            if parsed is not None:
+                df[col] = parsed
+            continue
+        if not _is_text(values):
+            continue
+
+        datetime_format = _infer_datetime_format(values)
+        if datetime_format is None:
+            continue
+        try:
+            df[col] = pd.to_datetime(values, format=datetime_format, utc="%z" in datetime_format)
+        except (ValueError, TypeError):
+            continue
+    return df
+
+
+def _downcast_numeric(values: pd.Series) -> pd.Series:
+    """Store numbers in the smallest type holding every value exactly."""
+    if pd.api.types.is_integer_dtype(values.dtype) and values.dtype.kind in "iu":
+        return pd.to_numeric(values, downcast="integer")
+    if values.dtype == np.float64:
+        as_float32 = values.to_numpy(dtype=np.float32)
+        if np.array_equal(as_float32, values.to_numpy(), equal_nan=True):
+            return pd.Series(as_float32, index=values.index, name=values.name)
+    return values
+
+
+def _few_distinct(values: pd.Series, distinct: int | None = None) -> bool:
+    """Whether a column has few enough distinct values to be stored as categories."""
+    if distinct is None:
+        distinct = values.nunique()
+    return distinct <= len(values) * _CATEGORY_MAX_UNIQUE_RATIO
+
+
+def _in_order_of_appearance(values: pd.Series) -> pd.Series:
+    """Reorder categories by first appearance, the order plots use for strings."""
+    codes = values.cat.codes.to_numpy()
+    first_seen = pd.unique(codes[codes >= 0])
+    if len(first_seen) < len(values.cat.categories):
+        values = values.cat.remove_unused_categories()
+        codes = values.cat.codes.to_numpy()
+        first_seen = pd.unique(codes[codes >= 0])
+    return values.cat.reorder_categories(values.cat.categories[first_seen])
+
+
+def compact_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduce the memory held by freshly parsed data.
+
+    String columns with few distinct values become categories, with the categories in
+    order of appearance so that plots order them as before. Numbers are downcast where
+    no value changes. Modifies and returns `df`.
+    """
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            df[col] = _in_order_of_appearance(values)
+        elif _is_text(values) and _few_distinct(values.iloc[:_SNIFF_ROWS]):
+            categories = pd.unique(values.dropna())
+            if _few_distinct(values, len(categories)):
+                df[col] = pd.Categorical(values, categories=categories)
+        elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            df[col] = _downcast_numeric(values)
+    return df
+
+
+def compaction_bytes(df: pd.DataFrame) -> tuple[int, int]:
+    """
+    Memory of the compacted columns before and after compaction.
+
+    Before is what the default parse holds: one string object per row for categories
+    and 64 bits per number. Other columns are left out, as compaction does not change
+    them and measuring strings is slow.
+    """
+    before = after = 0
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            sizes = np.array([sys.getsizeof(category) for category in values.cat.categories])
+            codes = values.cat.codes.to_numpy()
+            # One pointer per row, missing values point to a shared NaN
+            before += 8 * len(values) + int(sizes[codes[codes >= 0]].sum())
+        elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            before += 8 * len(values)
+        else:
+            continue
+        after += int(values.memory_usage(deep=True, index=False))
+    return before, after
+
+
+def _category_columns(csv_data: str) -> list[str]:
+    """String columns with few distinct values in the first rows of the CSV data."""
+    # Header and sample rows, without handing the whole text to the parser
+    end = -1
+    for _ in range(_SNIFF_ROWS + 1):
+        end = csv_data.find("\n", end + 1)
+        if end == -1:
+            end = len(csv_data)
+            break
+    sample = pd.read_csv(io.StringIO(csv_data[:end]))
+    return [col for col in sample.columns if _is_text(sample[col]) and _few_distinct(sample[col])]
+
+
+def read_csv(csv_data: str, skiprows: Callable[[Hashable], bool] | None = None) -> pd.DataFrame:
+    """
+    Parse CSV data into a compact DataFrame, optionally skipping rows.
+
+    Low-cardinality string columns are parsed straight into categories, so the strings
+    of every row are never held at once, then the result goes through
+    `compact_dataframe`.
+    """
+    dtype = dict.fromkeys(_category_columns(csv_data), "category")
+    # StringIO copies the text into 4 bytes per character, UTF-8 bytes take about one
+    df = pd.read_csv(io.BytesIO(csv_data.encode()), skiprows=skiprows, dtype=dtype)
+    return compact_dataframe(df)
+
+
+def prepare_dataframe(df: pd.DataFrame, plot_type: str) -> pd.DataFrame:
+    """
+    Adapt parsed data to the plot type.
+
+    Returns a new DataFrame, so the same parsed data can be prepared for other plot
+    types later.
+    """
+    df = df.copy(deep=False)
+    for col in df.columns:
+        # Downsampled or cached data may no longer contain every category, and seaborn
+        # would leave a gap or legend entry for each missing one
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.remove_unused_categories()
+    if plot_type in DATETIME_PLOT_TYPES:
+        df = parse_datetime_columns(df)
+    return df
+
+
+def downsample(df: pd.DataFrame, max_rows: int) -> pd.DataFrame:
+    """Keep every n-th row so that at most `max_rows` rows remain."""
+    step = math.ceil(len(df) / max_rows)
+    if step <= 1:
+        return df
+    return df.iloc[::step]
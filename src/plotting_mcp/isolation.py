@@ -0,0 +1,165 @@
+"""
+Rendering in a child process with resource limits, so one oversized plot cannot take
+the server down with it.
+
+Children are forked from a fork server that has preloaded the plotting modules and,
+with `PLOT_WARMUP`, warmed up the rendering path (see `plotting_mcp.preload`), rather
+than from the server itself, whose threads may hold locks at the time of the fork.
+"""
+
+import errno
+import functools
+import multiprocessing
+import resource
+import signal
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.context import ForkServerContext
+from typing import Any, Callable, Literal, TypeVar
+
+import pandas as pd
+
+from plotting_mcp.constants import (
+    PLOT_ISOLATION_CPU_SECONDS,
+    PLOT_ISOLATION_MEMORY_MB,
+    PLOT_ISOLATION_TIMEOUT_SECONDS,
+)
+from plotting_mcp.utils import sizeof_fmt
+
+T = TypeVar("T")
+
+Limit = Literal["memory", "cpu", "time"]
+
+# Imported once by the fork server, so children start with them loaded. The Agg
+# backend is otherwise imported by the first figure, in the child under its limits.
+_PRELOAD_MODULES = [
+    "matplotlib.backends.backend_agg",
+    "plotting_mcp.server",
+    "plotting_mcp.preload",
+]
+
+
+class RenderLimitError(ValueError):
+    """A render was stopped for exceeding one of its resource limits."""
+
+    def __init__(self, limit: Limit, message: str):
+        super().__init__(message)
+        self.limit = limit
+
+
+@dataclass(frozen=True)
+class RenderLimits:
+    """Resource limits of one isolated render."""
+
+    memory_bytes: int = PLOT_ISOLATION_MEMORY_MB * 1024 * 1024
+    cpu_seconds: int = PLOT_ISOLATION_CPU_SECONDS
+    timeout_seconds: float = PLOT_ISOLATION_TIMEOUT_SECONDS
+
+    def error(self, limit: Limit) -> RenderLimitError:
+        """Error for the tool response, naming the limit that was exceeded."""
+        exceeded = {
+            "memory": f"the memory limit of {sizeof_fmt(self.memory_bytes)}",
+            "cpu": f"the CPU time limit of {self.cpu_seconds}s",
+            "time": f"the time limit of {self.timeout_seconds:g}s",
+        }[limit]
+        return RenderLimitError(
+            limit,
+            f"Plot rendering exceeded {exceeded}. Send fewer rows, or use "
+            'quality="preview" or an aggregating plot type.',
+        )
+
+
+@functools.cache
+def _context() -> ForkServerContext:
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(_PRELOAD_MODULES)
+    return context
+
+
+def _out_of_memory(error: Exception) -> bool:
+    if isinstance(error, MemoryError):
+        return True
+    # The C parser of pandas reports failed allocations as a parser error
+    if isinstance(error, pd.errors.ParserError):
+        return "out of memory" in str(error)
+    # Loading an extension module maps it into the address space
+    if isinstance(error, (ImportError, OSError)):
+        return getattr(error, "errno", None) == errno.ENOMEM or (
+            "failed to map segment" in str(error)
+        )
+    return False
+
+
+def _run_child(
+    conn: Connection, limits: RenderLimits, fn: Callable[..., Any], args: tuple, kwargs: dict
+) -> None:
+    """Apply the limits, call `fn` and send back ("ok", result) or ("error", exception)."""
+    resource.setrlimit(resource.RLIMIT_AS, (limits.memory_bytes, limits.memory_bytes))
+    # SIGXCPU at the soft limit terminates the process, SIGKILL follows a second later
+    resource.setrlimit(resource.RLIMIT_CPU, (limits.cpu_seconds, limits.cpu_seconds + 1))
+    try:
+        try:
+            message = ("ok", fn(*args, **kwargs))
+        except Exception as e:
+            message = ("limit", "memory") if _out_of_memory(e) else ("error", e)
+        try:
+            conn.send(message)
+        except MemoryError:
+            conn.send(("limit", "memory"))
+        except Exception as e:
+            # Unpicklable result or exception
+            conn.send(("error", RuntimeError(f"{type(e).__name__}: {e}")))
+    finally:
+        conn.close()
+
+
+def _exit_error(exitcode: int | None, limits: RenderLimits) -> Exception:
+    """Error for a child that exited without sending a result."""
+    if exitcode == -signal.SIGXCPU:
+        return limits.error("cpu")
+    if exitcode == -signal.SIGKILL:
+        # Past the hard CPU limit, or chosen by the OOM killer at the container's limit
+        return limits.error("memory")
+    if exitcode is not None and exitcode < 0:
+        return RuntimeError(f"Plot rendering crashed with {signal.Signals(-exitcode).name}")
+    return RuntimeError(f"Plot rendering exited with code {exitcode}")
+
+
+def run_isolated(
+    fn: Callable[..., T], *args: Any, limits: RenderLimits | None = None, **kwargs: Any
+) -> T:
+    """
+    Call `fn(*args, **kwargs)` in a child process with resource limits.
+
+    `fn`, its arguments and its result must be picklable. Exceptions raised by `fn`
+    are re-raised. Raises RenderLimitError when the child exceeds its address space
+    (`RLIMIT_AS`) or CPU time (`RLIMIT_CPU`), or does not answer before the deadline,
+    in which case it is killed.
+    """
+    limits = limits or RenderLimits()
+    context = _context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_run_child, args=(sender, limits, fn, args, kwargs), name="render", daemon=True
+    )
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(limits.timeout_seconds):
+            raise limits.error("time")
+        try:
+            status, value = receiver.recv()
+        except EOFError:
+            process.join()
+            raise _exit_error(process.exitcode, limits) from None
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        receiver.close()
+
+    if status == "limit":
+        raise limits.error(value)
+    if status == "error":
+        raise value
+    return value
@@ -0,0 +1,37 @@
+"""
+Seeding of matplotlib's cache directory from a cache baked into the image.
+
+Kept free of matplotlib imports: the font list is loaded when matplotlib is first
+imported, so the cache must be in place before that.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+from plotting_mcp.constants import MPL_CACHE_SEED_DIR
+
+
+def seed_matplotlib_cache(seed_dir: str = MPL_CACHE_SEED_DIR) -> list[str]:
+    """
+    Copy the files of `seed_dir` into `MPLCONFIGDIR` unless they already exist there.
+
+    Matplotlib only uses a writable cache directory, so a read-only baked cache cannot
+    be used in place. Returns the names of the copied files.
+    """
+    config_dir = os.getenv("MPLCONFIGDIR")
+    if not seed_dir or not config_dir or not Path(seed_dir).is_dir():
+        return []
+
+    copied = []
+    try:
+        Path(config_dir).mkdir(parents=True, exist_ok=True)
+        for source in Path(seed_dir).iterdir():
+            target = Path(config_dir) / source.name
+            if source.is_file() and not target.exists():
+                shutil.copyfile(source, target)
+                copied.append(source.name)
+    except OSError:
+        # Matplotlib rebuilds whatever is missing
+        pass
+    return copied
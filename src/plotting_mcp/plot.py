@@ -1,14 +1,24 @@
 import io
+import threading
 from typing import Literal
 
 import cartopy.crs as ccrs
-import cartopy.feature as cfeature
+import matplotlib as mpl
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import seaborn as sns
+import shapely
+from cartopy.io import shapereader
 from cartopy.mpl.geoaxes import GeoAxes
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 
-from plotting_mcp.constants import PLOT_DPI, PLOT_FIGURE_SIZE
+from plotting_mcp.aggregate import grouped_box_stats, histogram, histogram2d, numeric_values
+from plotting_mcp.constants import PLOT_DPI, PLOT_FIGURE_SIZE, PLOT_PREVIEW_DPI
+
+# Previews are drafts: rendered at a lower DPI and with cheaper map features
+Quality = Literal["preview", "full"]
 
 
 def _auto_rotate_labels(ax: plt.Axes, axis: Literal["x", "y"] = "x") -> None:
@@ -45,17 +55,169 @@ def _auto_rotate_labels(ax: plt.Axes, axis: Literal["x", "y"] = "x") -> None:
         ax.tick_params(axis=axis, labelrotation=90)
 
 
-def _create_world_map_plot(ax: GeoAxes, df: pd.DataFrame, **kwargs) -> None:
-    """Create a world map with coordinate points."""
-    # Add map features
-    ax.add_feature(cfeature.COASTLINE)
-    ax.add_feature(cfeature.BORDERS)
-    ax.add_feature(cfeature.OCEAN, color="lightblue")
-    ax.add_feature(cfeature.LAND, color="lightgray")
+MapExtent = tuple[float, float, float, float]
+
+GLOBAL_EXTENT: MapExtent = (-180.0, 180.0, -90.0, 90.0)
+
+# Natural Earth features drawn on world maps, in drawing order, with their style.
+# Ocean and land sit below everything else like cartopy's predefined features.
+MAP_FEATURES = [
+    ("physical", "ocean", {"facecolor": "lightblue", "edgecolor": "lightblue", "zorder": -1}),
+    ("physical", "land", {"facecolor": "lightgray", "edgecolor": "lightgray", "zorder": -1}),
+    ("physical", "coastline", {"facecolor": "none", "edgecolor": "black"}),
+    ("cultural", "admin_0_boundary_lines_land", {"facecolor": "none", "edgecolor": "black"}),
+]
+
+
+def _compute_map_extent(
+    lons: pd.Series, lats: pd.Series, padding: float = 0.1, min_padding: float = 0.5
+) -> MapExtent:
+    """
+    Compute a map extent (lon_min, lon_max, lat_min, lat_max) around the given points.
+
+    Each side is padded by `padding` times the span of the points, and by at least
+    `min_padding` degrees so that a cluster of nearby points still shows its
+    surroundings. Points spread over most of the globe get the global extent.
+    """
+    lon_min, lon_max = float(np.min(lons)), float(np.max(lons))
+    lat_min, lat_max = float(np.min(lats)), float(np.max(lats))
+
+    lon_pad = max((lon_max - lon_min) * padding, min_padding)
+    lat_pad = max((lat_max - lat_min) * padding, min_padding)
+    extent = (
+        max(lon_min - lon_pad, -180.0),
+        min(lon_max + lon_pad, 180.0),
+        max(lat_min - lat_pad, -90.0),
+        min(lat_max + lat_pad, 90.0),
+    )
 
-    # Set global extent
-    ax.set_global()
+    if extent[1] - extent[0] >= 270 or extent[3] - extent[2] >= 135:
+        return GLOBAL_EXTENT
+    return extent
+
+
+def _select_feature_scale(extent: MapExtent) -> Literal["110m", "50m", "10m"]:
+    """Choose the Natural Earth scale whose level of detail suits the map extent."""
+    span = max(extent[1] - extent[0], extent[3] - extent[2])
+    if span >= 60:
+        return "110m"
+    if span >= 15:
+        return "50m"
+    return "10m"
+
+
+# Resident memory of a feature index per coordinate, measured with shapely 2.1 and
+# GEOS 3.13 on layers of a million coordinates (`benchmark.py feature-indices`): GEOS
+# stores three doubles per coordinate, plus the geometries, the tree and what reading
+# the shapefile leaves allocated
+FEATURE_INDEX_BYTES_PER_COORDINATE = 44
+
+
+def _read_feature_index(category: str, name: str, scale: str) -> tuple[shapely.STRtree, int]:
+    """
+    Load a Natural Earth shapefile into a spatial index over the parts of its geometries.
+
+    The ocean and land layers hold a few multipolygon records spanning the globe, so
+    they are split into their polygons for the index to narrow down a region. Returns
+    the index and its estimated memory in bytes.
+    """
+    path = shapereader.natural_earth(resolution=scale, category=category, name=name)
+    parts = shapely.get_parts(list(shapereader.Reader(path).geometries()))
+    coordinates = int(shapely.get_num_coordinates(parts).sum())
+    return shapely.STRtree(parts), coordinates * FEATURE_INDEX_BYTES_PER_COORDINATE
+
+
+class FeatureIndexCache:
+    """
+    Thread-safe cache of map feature indices, holding the 110m layers and the layers of
+    the last detailed scale drawn.
+
+    Previews draw 110m whatever the extent, and its layers are small. The detailed
+    layers of 10m take tens of MiB, so a map at another scale replaces them.
+    """
+
+    def __init__(self) -> None:
+        self._coarse: dict[tuple[str, str], tuple[shapely.STRtree, int]] = {}
+        self._detailed: dict[tuple[str, str], tuple[shapely.STRtree, int]] = {}
+        self._detailed_scale: str | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated memory of the stored indices."""
+        with self._lock:
+            entries = [*self._coarse.values(), *self._detailed.values()]
+        return sum(nbytes for _, nbytes in entries)
+
+    def get(self, category: str, name: str, scale: str) -> shapely.STRtree:
+        """Return the index of a feature, loading it on first use."""
+        with self._lock:
+            if scale == "110m":
+                entries = self._coarse
+            else:
+                if scale != self._detailed_scale:
+                    # Dropped before loading, so two detailed scales are never both kept
+                    self._detailed.clear()
+                    self._detailed_scale = scale
+                entries = self._detailed
+            if (category, name) not in entries:
+                entries[(category, name)] = _read_feature_index(category, name, scale)
+            return entries[(category, name)][0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._coarse.clear()
+            self._detailed.clear()
+            self._detailed_scale = None
+
+
+feature_indices = FeatureIndexCache()
+
+
+def _load_feature_index(category: str, name: str, scale: str) -> shapely.STRtree:
+    return feature_indices.get(category, name, scale)
+
+
+def load_map_features() -> None:
+    """Load the map features that are kept: 110m, and 10m as the slowest detailed scale."""
+    for scale in ("110m", "10m"):
+        for category, name, _ in MAP_FEATURES:
+            _load_feature_index(category, name, scale)
+
+
+def _clip_feature_geometries(category: str, name: str, scale: str, extent: MapExtent) -> np.ndarray:
+    """Return the geometries of a Natural Earth feature clipped to the map extent."""
+    index = _load_feature_index(category, name, scale)
+    if extent == GLOBAL_EXTENT:
+        return index.geometries
+
+    region = shapely.box(extent[0], extent[2], extent[1], extent[3])
+    candidates = index.geometries.take(index.query(region))
+    clipped = shapely.intersection(candidates, region)
+    return clipped[~shapely.is_empty(clipped)]
+
+
+def _add_map_features(ax: GeoAxes, extent: MapExtent, quality: Quality = "full") -> None:
+    """
+    Draw the map features intersecting the extent at a scale suited to it.
+
+    Previews only draw the coarsest coastlines.
+    """
+    if quality == "preview":
+        scale = "110m"
+        features = [feature for feature in MAP_FEATURES if feature[1] == "coastline"]
+    else:
+        scale = _select_feature_scale(extent)
+        features = MAP_FEATURES
+    for category, name, style in features:
+        geometries = _clip_feature_geometries(category, name, scale, extent)
+        ax.add_geometries(geometries, crs=ccrs.PlateCarree(), **style)
 
+
+def _create_world_map_plot(
+    ax: GeoAxes, df: pd.DataFrame, quality: Quality = "full", **kwargs
+) -> None:
+    """Create a world map with coordinate points."""
     # Extract coordinate columns - support common naming conventions
     lat_col = None
     lon_col = None
@@ -80,6 +242,23 @@ def _create_world_map_plot(ax: GeoAxes, df: pd.DataFrame, **kwargs) -> None:
             "Expected columns named: lat/latitude/y and lon/long/lng/longitude/x"
         )
 
+    # Fit the map to the points unless an explicit extent is requested
+    extent = kwargs.pop("extent", None)
+    if extent is None:
+        extent = _compute_map_extent(df[lon_col], df[lat_col])
+    elif extent == "global":
+        extent = GLOBAL_EXTENT
+    else:
+        extent = tuple(float(value) for value in extent)
+        if len(extent) != 4:
+            raise ValueError("Map extent must be 'global' or [lon_min, lon_max, lat_min, lat_max]")
+
+    _add_map_features(ax, extent, quality)
+    if extent == GLOBAL_EXTENT:
+        ax.set_global()
+    else:
+        ax.set_extent(extent, crs=ccrs.PlateCarree())
+
     # Extract plotting parameters
     marker_size = kwargs.pop("s", 50)
     marker_color = kwargs.pop("c", "red")
@@ -135,8 +314,199 @@ def _create_pie_plot(ax: plt.Axes, df: pd.DataFrame, **kwargs) -> None:
         )
 
 
+def _first_numeric_columns(df: pd.DataFrame, count: int, plot_type: str) -> list[str]:
+    """Default columns of the aggregating plots: the first `count` numeric columns."""
+    columns = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
+    if len(columns) < count:
+        raise ValueError(f"{plot_type.capitalize()} requires {count} numeric column(s)")
+    return columns[:count]
+
+
+def _create_histogram_plot(ax: plt.Axes, df: pd.DataFrame, **kwargs) -> None:
+    """Create a histogram, drawn as a single outline whatever the number of bins."""
+    x = kwargs.pop("x", None) or _first_numeric_columns(df, 1, "histogram")[0]
+    bins = int(kwargs.pop("bins", 30))
+    value_range = kwargs.pop("range", None)
+    density = kwargs.pop("density", False)
+
+    counts, edges = histogram(
+        numeric_values(df, x), bins, tuple(value_range) if value_range else None
+    )
+    heights = counts / (counts.sum() * np.diff(edges)) if density else counts
+    kwargs.setdefault("color", sns.color_palette()[0])
+    ax.stairs(heights, edges, fill=True, alpha=kwargs.pop("alpha", 0.75), **kwargs)
+
+    ax.set_xlabel(x)
+    ax.set_ylabel("Density" if density else "Count")
+
+
+def _create_heatmap_plot(ax: plt.Axes, df: pd.DataFrame, **kwargs) -> None:
+    """Create a heatmap of the number of (x, y) pairs per cell of a 2D grid."""
+    default_x, default_y = _first_numeric_columns(df, 2, "heatmap")
+    x = kwargs.pop("x", None) or default_x
+    y = kwargs.pop("y", None) or default_y
+    bins = kwargs.pop("bins", 50)
+    if isinstance(bins, (int, float)):
+        bins = (bins, bins)
+    elif not isinstance(bins, (list, tuple)) or len(bins) != 2:
+        raise ValueError(f"Heatmap bins must be a number or a pair [x_bins, y_bins], got {bins!r}")
+
+    counts, x_edges, y_edges = histogram2d(
+        numeric_values(df, x), numeric_values(df, y), (int(bins[0]), int(bins[1]))
+    )
+    # Counts are indexed [x, y], pcolormesh expects rows along y
+    mesh = ax.pcolormesh(x_edges, y_edges, counts.T, cmap=kwargs.pop("cmap", "rocket"), **kwargs)
+    ax.figure.colorbar(mesh, ax=ax, label="Count")
+
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+
+
+def _create_box_plot(ax: plt.Axes, df: pd.DataFrame, **kwargs) -> None:
+    """Create box plots of a numeric column, optionally one per group of `x`."""
+    y = kwargs.pop("y", None) or _first_numeric_columns(df, 1, "box")[0]
+    x = kwargs.pop("x", None)
+    if x is not None and x not in df.columns:
+        raise ValueError(f"Column '{x}' not found. Available columns: {list(df.columns)}")
+
+    stats = grouped_box_stats(numeric_values(df, y), df[x] if x is not None else None)
+    kwargs.setdefault("boxprops", {"facecolor": sns.color_palette()[0]})
+    kwargs.setdefault("medianprops", {"color": "black"})
+    ax.bxp([box.as_bxp() for box in stats], patch_artist=True, **kwargs)
+
+    if x is not None:
+        ax.set_xlabel(x)
+    ax.set_ylabel(y)
+
+
+# Line plot kwargs the native renderer reproduces exactly. Anything else goes to seaborn.
+_FAST_LINE_PLOT_KWARGS = {"x", "y", "hue", "palette", "errorbar"}
+
+
+def _create_fast_line_plot(ax: plt.Axes, df: pd.DataFrame, **kwargs) -> bool:
+    """
+    Draw a line plot with one line per hue level as a single LineCollection.
+
+    Equivalent to `sns.lineplot` when every hue level has at most one value per x, as
+    no aggregation or error band is needed then. Seaborn creates one Line2D (and one
+    empty error band) per level, which gets slow with many levels.
+
+    Returns False without drawing anything when the data or kwargs need seaborn.
+    """
+    x, y, hue = kwargs.get("x"), kwargs.get("y"), kwargs.get("hue")
+    palette = kwargs.get("palette")
+    if not (isinstance(x, str) and isinstance(y, str) and isinstance(hue, str)):
+        return False
+    if (
+        not set(kwargs) <= _FAST_LINE_PLOT_KWARGS
+        or not all(col in df.columns for col in (x, y, hue))
+        or not (palette is None or isinstance(palette, str))
+    ):
+        return False
+    # Seaborn maps numeric and boolean hues to a continuous palette
+    if not all(pd.api.types.is_numeric_dtype(df[col]) for col in (x, y)) or any(
+        pd.api.types.is_bool_dtype(df[col]) for col in (x, y)
+    ):
+        return False
+    hue_values = df[hue]
+    if not (
+        isinstance(hue_values.dtype, pd.CategoricalDtype)
+        or pd.api.types.is_object_dtype(hue_values)
+        or pd.api.types.is_string_dtype(hue_values)
+    ):
+        return False
+
+    # Same level order as seaborn: categories, or order of appearance
+    if isinstance(hue_values.dtype, pd.CategoricalDtype):
+        levels = hue_values.cat.categories
+    else:
+        levels = pd.unique(hue_values)
+    codes = pd.Categorical(hue_values, categories=levels).codes
+    xs = df[x].to_numpy(dtype=float)
+    ys = df[y].to_numpy(dtype=float)
+
+    # Sort once by level, then x, instead of sorting every level separately
+    order = np.lexsort((xs, codes))
+    codes, xs, ys = codes[order], xs[order], ys[order]
+
+    same_level = codes[1:] == codes[:-1]
+    if np.any(same_level & (xs[1:] == xs[:-1])):
+        # Repeated x values within a level are aggregated by seaborn
+        return False
+
+    starts = np.flatnonzero(~same_level) + 1
+    segments = np.split(np.column_stack((xs, ys)), starts)
+
+    if palette is None and len(levels) <= len(mpl.rcParams["axes.prop_cycle"]):
+        colors = sns.color_palette(None, len(levels))
+    else:
+        colors = sns.color_palette(palette or "husl", len(levels))
+
+    lines = LineCollection(
+        segments,
+        colors=[colors[code] for code in codes[np.r_[0, starts]]],
+        linewidths=mpl.rcParams["lines.linewidth"],
+        capstyle=mpl.rcParams["lines.solid_capstyle"],
+        joinstyle=mpl.rcParams["lines.solid_joinstyle"],
+        zorder=Line2D.zorder,
+    )
+    ax.add_collection(lines)
+    ax.autoscale_view()
+
+    # Legend placement ("best") only avoids Line2D paths, not LineCollections. A single
+    # hidden line through every segment, broken by NaNs, is never drawn but lets the
+    # legend be placed where seaborn would put it without an artist per level.
+    ax.add_artist(
+        Line2D(np.insert(xs, starts, np.nan), np.insert(ys, starts, np.nan), visible=False)
+    )
+
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+    handles = [
+        Line2D([], [], color=color, label=str(level))
+        for level, color in zip(levels, colors, strict=True)
+    ]
+    ax.legend(handles=handles, title=hue)
+    return True
+
+
+# Estimators that return the value of a group of one, so applying them again to
+# aggregated data gives the same bars
+_IDEMPOTENT_ESTIMATORS = {"mean", "median", "sum", "min", "max"}
+
+
+def _aggregate_bar_data(df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    """
+    Reduce bar plot data to one row per bar, so seaborn groups that instead of every row.
+
+    Seaborn converts categorical columns back to object arrays while grouping, which
+    costs more memory than the compact data itself. Without error bars the plot only
+    needs the estimate of each (x, hue) group, which pandas computes on the categories
+    directly. Returns `df` unchanged when the plot needs the rows themselves.
+    """
+    x, y, hue = kwargs.get("x"), kwargs.get("y"), kwargs.get("hue")
+    estimator = kwargs.get("estimator", "mean")
+    if not (isinstance(x, str) and isinstance(y, str)) or not (hue is None or isinstance(hue, str)):
+        return df
+    if (
+        "errorbar" not in kwargs
+        or kwargs["errorbar"] is not None
+        or not (isinstance(estimator, str) and estimator in _IDEMPOTENT_ESTIMATORS)
+        # These change which values are grouped or how they are weighted
+        or any(key in kwargs for key in ("orient", "units", "weights"))
+    ):
+        return df
+    keys = [x] if hue is None else [x, hue]
+    if not all(col in df.columns for col in (*keys, y)) or y in keys:
+        return df
+    if not pd.api.types.is_numeric_dtype(df[y]) or pd.api.types.is_bool_dtype(df[y]):
+        return df
+    # Groups in order of appearance, and categories keep their dtype and so their order
+    return df.groupby(keys, observed=True, sort=False)[y].agg(estimator).reset_index()
+
+
 def _create_plot(  # noqa: C901
-    df: pd.DataFrame, plot_type: str, **kwargs
+    df: pd.DataFrame, plot_type: str, quality: Quality = "full", **kwargs
 ) -> tuple[plt.Figure, plt.Axes]:
     """Create a plot using matplotlib/seaborn."""
     if df.empty:
@@ -146,18 +516,20 @@ def _create_plot(  # noqa: C901
     if df.isnull().any().any():
         raise ValueError("CSV data contains NaN/null values. Please ensure all data is complete.")
 
-    supported_plot_types = ["line", "bar", "pie", "worldmap"]
+    supported_plot_types = ["line", "bar", "pie", "worldmap", "histogram", "heatmap", "box"]
     if plot_type not in supported_plot_types:
         raise ValueError(
             f"Unsupported plot type: {plot_type}. Supported types: {supported_plot_types}"
         )
 
+    dpi = PLOT_PREVIEW_DPI if quality == "preview" else PLOT_DPI
+
     # Create figure with appropriate projection for world map
     if plot_type == "worldmap":
-        fig = plt.figure(figsize=PLOT_FIGURE_SIZE, dpi=PLOT_DPI)
+        fig = plt.figure(figsize=PLOT_FIGURE_SIZE, dpi=dpi)
         ax = fig.add_subplot(1, 1, 1, projection=ccrs.PlateCarree())
     else:
-        fig, ax = plt.subplots(figsize=PLOT_FIGURE_SIZE, dpi=PLOT_DPI)
+        fig, ax = plt.subplots(figsize=PLOT_FIGURE_SIZE, dpi=dpi)
 
     # Extract optional parameters for figure title and axis labels
     # These are not accepted by Seaborn
@@ -166,17 +538,25 @@ def _create_plot(  # noqa: C901
     ylabel = kwargs.pop("ylabel", None)
 
     if plot_type == "line":
-        sns.lineplot(data=df, ax=ax, **kwargs)
+        if not _create_fast_line_plot(ax, df, **kwargs):
+            sns.lineplot(data=df, ax=ax, **kwargs)
     elif plot_type == "bar":
-        sns.barplot(data=df, ax=ax, **kwargs)
+        sns.barplot(data=_aggregate_bar_data(df, **kwargs), ax=ax, **kwargs)
     elif plot_type == "pie":
         _create_pie_plot(ax, df, **kwargs)
+    elif plot_type == "histogram":
+        _create_histogram_plot(ax, df, **kwargs)
+    elif plot_type == "heatmap":
+        _create_heatmap_plot(ax, df, **kwargs)
+    elif plot_type == "box":
+        _create_box_plot(ax, df, **kwargs)
     elif plot_type == "worldmap":
         # Cartopy doesn't return correct Axes type, so we ignore type checking
-        _create_world_map_plot(ax, df, **kwargs)  # ty: ignore[invalid-argument-type]
+        _create_world_map_plot(ax, df, quality, **kwargs)  # ty: ignore[invalid-argument-type]
 
-    # Auto-rotate x-axis labels if needed (not applicable for pie charts or world maps)
-    if plot_type not in ["pie", "worldmap"]:
+    # Auto-rotate x-axis labels if needed (not applicable for pie charts, world maps or
+    # the numeric axes of histograms and heatmaps)
+    if plot_type not in ["pie", "worldmap", "histogram", "heatmap"]:
         _auto_rotate_labels(ax, axis="x")
 
     # Set titles and labels
@@ -192,9 +572,9 @@ def _create_plot(  # noqa: C901
     return fig, ax
 
 
-def plot_to_bytes(df: pd.DataFrame, plot_type: str, **kwargs) -> bytes:
+def plot_to_bytes(df: pd.DataFrame, plot_type: str, quality: Quality = "full", **kwargs) -> bytes:
     """Generate a plot and return it as bytes."""
-    fig, _ = _create_plot(df, plot_type, **kwargs)
+    fig, _ = _create_plot(df, plot_type, quality, **kwargs)
     buffer = io.BytesIO()
     fig.savefig(buffer, format="png", bbox_inches="tight")
     plt.close(fig)
@@ -0,0 +1,30 @@
+"""
+Warm-up of the render fork server, imported by it before it forks any child.
+
+Children are forked with everything the fork server has loaded, so with `PLOT_WARMUP`
+it renders the warm-up plots and loads the 110m and 10m map features once, instead
+of every isolated render paying for fonts, glyph caches and map features again.
+
+Nothing is logged: the fork server's output is not the server's log, and may be its
+stdio transport. A failed step is skipped, leaving children to load it themselves.
+"""
+
+import contextlib
+
+from plotting_mcp.constants import PLOT_WARMUP
+from plotting_mcp.ingest import prepare_dataframe
+from plotting_mcp.plot import load_map_features, plot_to_bytes
+from plotting_mcp.warmup import WARMUP_PLOTS
+
+
+def warm_fork_server() -> None:
+    """Render one throwaway plot of each type and load the map features that are kept."""
+    for plot_type, data, kwargs in WARMUP_PLOTS:
+        with contextlib.suppress(Exception):
+            plot_to_bytes(prepare_dataframe(data(), plot_type), plot_type, **kwargs)
+    with contextlib.suppress(Exception):
+        load_map_features()
+
+
+if PLOT_WARMUP:
+    warm_fork_server()
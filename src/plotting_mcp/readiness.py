@@ -0,0 +1,145 @@
+"""Readiness check reporting how saturated the server is."""
+
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from plotting_mcp.constants import (
+    PLOT_MEMORY_LIMIT_MB,
+    PLOT_READY_MAX_P95_SECONDS,
+    PLOT_READY_MAX_QUEUE_DEPTH,
+    PLOT_READY_MAX_RENDER_SECONDS,
+    PLOT_READY_MIN_MEMORY_HEADROOM_MB,
+)
+from plotting_mcp.scheduler import RenderScheduler
+from plotting_mcp.utils import sizeof_fmt
+
+# (limit, usage, stats, inactive file stat) of cgroup v2 and v1. Like the kubelet,
+# usage excludes inactive page cache, which is reclaimed before the OOM killer runs.
+_CGROUP_MEMORY_FILES = [
+    ("memory.max", "memory.current", "memory.stat", "inactive_file"),
+    (
+        "memory/memory.limit_in_bytes",
+        "memory/memory.usage_in_bytes",
+        "memory/memory.stat",
+        "total_inactive_file",
+    ),
+]
+
+# cgroup v1 reports "no limit" as a huge number rather than "max"
+_UNLIMITED_BYTES = 1 << 60
+
+
+def _read_int(path: Path) -> int | None:
+    try:
+        value = path.read_text().strip()
+    except OSError:
+        return None
+    return int(value) if value.isdigit() else None
+
+
+def _cgroup_memory(root: Path) -> tuple[int | None, int | None]:
+    """Memory limit and working set of the container's cgroup, None when unknown."""
+    for limit_file, usage_file, stat_file, inactive_key in _CGROUP_MEMORY_FILES:
+        usage = _read_int(root / usage_file)
+        if usage is None:
+            continue
+        limit = _read_int(root / limit_file)
+        if limit is not None and limit >= _UNLIMITED_BYTES:
+            limit = None
+        try:
+            for line in (root / stat_file).read_text().splitlines():
+                key, _, value = line.partition(" ")
+                if key == inactive_key:
+                    usage -= min(int(value), usage)
+                    break
+        except OSError:
+            pass
+        return limit, usage
+    return None, None
+
+
+def _process_rss() -> int | None:
+    """Resident memory of this process, None outside Linux."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def memory_headroom(cgroup_root: Path = Path("/sys/fs/cgroup")) -> int | None:
+    """
+    Bytes left before the server reaches its memory limit, None without a limit.
+
+    The limit is `PLOT_MEMORY_LIMIT_MB` if set, the container's cgroup limit otherwise.
+    """
+    limit, usage = _cgroup_memory(cgroup_root)
+    if PLOT_MEMORY_LIMIT_MB:
+        limit = PLOT_MEMORY_LIMIT_MB * 1024 * 1024
+    if usage is None:
+        usage = _process_rss()
+    if limit is None or usage is None:
+        return None
+    return limit - usage
+
+
+@dataclass
+class ReadinessReport:
+    """Saturation of the server, and why it should not receive new sessions."""
+
+    in_flight: int
+    queue_depth: int
+    longest_render_seconds: float
+    p95_latency_seconds: float | None
+    memory_headroom_bytes: int | None
+    reasons: list[str] = field(default_factory=list)
+
+    @property
+    def ready(self) -> bool:
+        return not self.reasons
+
+    def as_dict(self) -> dict:
+        return {"status": "ready" if self.ready else "saturated", **asdict(self)}
+
+
+def check_readiness(
+    scheduler: RenderScheduler, headroom_bytes: int | None = None
+) -> ReadinessReport:
+    """
+    Compare the scheduler's statistics and the memory headroom to the thresholds.
+
+    `headroom_bytes` defaults to the current `memory_headroom()`.
+    """
+    if headroom_bytes is None:
+        headroom_bytes = memory_headroom()
+    report = ReadinessReport(
+        in_flight=scheduler.in_flight,
+        queue_depth=scheduler.queue_depth,
+        longest_render_seconds=round(scheduler.longest_render_seconds, 3),
+        p95_latency_seconds=scheduler.latency_percentile(95),
+        memory_headroom_bytes=headroom_bytes,
+    )
+
+    if report.queue_depth > PLOT_READY_MAX_QUEUE_DEPTH:
+        report.reasons.append(
+            f"{report.queue_depth} requests waiting (max {PLOT_READY_MAX_QUEUE_DEPTH})"
+        )
+    if report.longest_render_seconds > PLOT_READY_MAX_RENDER_SECONDS:
+        report.reasons.append(
+            f"a render has been running for {report.longest_render_seconds:.1f}s "
+            f"(max {PLOT_READY_MAX_RENDER_SECONDS:.1f}s)"
+        )
+    if report.p95_latency_seconds is not None and (
+        report.p95_latency_seconds > PLOT_READY_MAX_P95_SECONDS
+    ):
+        report.reasons.append(
+            f"p95 latency is {report.p95_latency_seconds:.1f}s "
+            f"(max {PLOT_READY_MAX_P95_SECONDS:.1f}s)"
+        )
+    min_headroom = PLOT_READY_MIN_MEMORY_HEADROOM_MB * 1024 * 1024
+    if headroom_bytes is not None and headroom_bytes < min_headroom:
+        report.reasons.append(
+            f"{sizeof_fmt(max(headroom_bytes, 0))} memory headroom (min {sizeof_fmt(min_headroom)})"
+        )
+    return report
@@ -0,0 +1,337 @@
+"""Cost estimation, admission control and scheduling for plot requests."""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Callable, Hashable, Iterator, Literal, cast
+
+from plotting_mcp.constants import (
+    PLOT_DPI,
+    PLOT_FAST_LANE_MAX_COST,
+    PLOT_HEIGHT,
+    PLOT_LATENCY_WINDOW_SECONDS,
+    PLOT_MAX_CONCURRENT_RENDERS,
+    PLOT_MEMORY_BUDGET_MB,
+    PLOT_SLOW_LANE_MAX_WAIT_SECONDS,
+    PLOT_WIDTH,
+)
+from plotting_mcp.utils import sizeof_fmt
+
+Lane = Literal["fast", "slow"]
+
+# Parsing holds the CSV text plus the DataFrame built from it, and object (string)
+# columns take several times the bytes of their text representation.
+_PARSE_OVERHEAD = 4.0
+
+# Approximate bytes held per row while rendering, on top of the parsed DataFrame.
+# Pie charts create one wedge patch (plus label and autopct texts) per row. Histograms
+# and heatmaps bin the data in fixed-size chunks and draw one artist, box plots copy
+# and sort the value column once.
+_RENDER_BYTES_PER_ROW = {
+    "line": 160,
+    "bar": 120,
+    "pie": 2048,
+    "worldmap": 240,
+    "histogram": 0,
+    "heatmap": 0,
+    "box": 24,
+}
+
+# Relative CPU cost per row, normalised so that one row of a line plot costs 1.
+_CPU_COST_PER_ROW = {
+    "line": 1.0,
+    "bar": 1.5,
+    "pie": 40.0,
+    "worldmap": 2.0,
+    "histogram": 0.05,
+    "heatmap": 0.1,
+    "box": 0.5,
+}
+
+# Fixed CPU cost per plot type (figure setup, map features) in the same units.
+_CPU_BASE_COST = {
+    "line": 5_000,
+    "bar": 5_000,
+    "pie": 2_000,
+    "worldmap": 50_000,
+    "histogram": 5_000,
+    "heatmap": 10_000,
+    "box": 5_000,
+}
+
+# Plot types that still make sense when only every n-th row is drawn. Pie charts,
+# two-column breakdowns and the aggregating plots (histogram, heatmap, box) would show
+# wrong totals, so they are rejected instead.
+DOWNSAMPLABLE_PLOT_TYPES = {"line", "bar", "worldmap"}
+
+# Estimators of line and bar plots that a subsample of the rows still estimates. Sums
+# and counts would be divided by the sampling step. None draws every row (line plots).
+_DOWNSAMPLABLE_ESTIMATORS = {"mean", "median", None}
+
+# Downsampling below this many rows no longer resembles the requested plot.
+_MIN_DOWNSAMPLED_ROWS = 500
+
+# Request latencies kept for the readiness check at most, whatever their age
+_MAX_LATENCY_SAMPLES = 1_000
+
+
+def count_csv_rows(csv_data: str) -> int:
+    """Count the data rows of a CSV string without parsing it."""
+    if not csv_data:
+        return 0
+    lines = csv_data.count("\n") + (0 if csv_data.endswith("\n") else 1)
+    # The first line is the header
+    return max(lines - 1, 0)
+
+
+def is_downsamplable(plot_type: str, kwargs: dict | None = None) -> bool:
+    """Whether a plot still shows the right values when only every n-th row is drawn."""
+    if plot_type not in DOWNSAMPLABLE_PLOT_TYPES:
+        return False
+    if plot_type in ("line", "bar"):
+        # Like seaborn, which defaults to the mean
+        return (kwargs or {}).get("estimator", "mean") in _DOWNSAMPLABLE_ESTIMATORS
+    return True
+
+
+@dataclass(frozen=True)
+class PlotCost:
+    """Estimated cost of rendering a plot."""
+
+    plot_type: str
+    rows: int
+    parse_bytes: int
+    render_bytes: int
+    canvas_bytes: int
+    cpu_units: float
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.parse_bytes + self.render_bytes + self.canvas_bytes
+
+    @property
+    def lane(self) -> Lane:
+        return "fast" if self.cpu_units <= PLOT_FAST_LANE_MAX_COST else "slow"
+
+    def downsampled(self, step: int) -> "PlotCost":
+        """Cost of the same plot when only every `step`-th row is kept."""
+        rows = math.ceil(self.rows / step)
+        cpu_per_row = _CPU_COST_PER_ROW.get(self.plot_type, _CPU_COST_PER_ROW["line"])
+        return replace(
+            self,
+            rows=rows,
+            parse_bytes=math.ceil(self.parse_bytes / step),
+            render_bytes=math.ceil(self.render_bytes / step),
+            cpu_units=self.cpu_units - (self.rows - rows) * cpu_per_row,
+        )
+
+
+def estimate_cost(plot_type: str, rows: int, payload_bytes: int) -> PlotCost:
+    """
+    Estimate the CPU and memory cost of a plot request.
+
+    Args:
+        plot_type (str): Type of plot requested.
+        rows (int): Number of data rows.
+        payload_bytes (int): Size of the data that still has to be parsed. Use 0 for
+            data that is already held as a DataFrame.
+    """
+    # Unknown plot types are rejected later by `_create_plot` with a clearer message
+    render_per_row = _RENDER_BYTES_PER_ROW.get(plot_type, _RENDER_BYTES_PER_ROW["line"])
+    cpu_per_row = _CPU_COST_PER_ROW.get(plot_type, _CPU_COST_PER_ROW["line"])
+    cpu_base = _CPU_BASE_COST.get(plot_type, _CPU_BASE_COST["line"])
+
+    # RGBA buffer of the canvas plus roughly as much again while encoding the PNG
+    canvas_bytes = int(PLOT_WIDTH * PLOT_DPI * PLOT_HEIGHT * PLOT_DPI * 4 * 2)
+
+    return PlotCost(
+        plot_type=plot_type,
+        rows=rows,
+        parse_bytes=int(payload_bytes * _PARSE_OVERHEAD),
+        render_bytes=rows * render_per_row,
+        canvas_bytes=canvas_bytes,
+        cpu_units=cpu_base + rows * cpu_per_row,
+    )
+
+
+@dataclass(frozen=True)
+class AdmissionDecision:
+    """Outcome of admission control for a plot request."""
+
+    action: Literal["accept", "downgrade", "reject"]
+    cost: PlotCost
+    budget_bytes: int
+    sample_step: int = 1
+
+    @property
+    def effective_cost(self) -> PlotCost:
+        """Cost of the plot that will actually be rendered."""
+        if self.sample_step == 1:
+            return self.cost
+        return self.cost.downsampled(self.sample_step)
+
+    @property
+    def lane(self) -> Lane:
+        return self.effective_cost.lane
+
+    @property
+    def skiprows(self) -> Callable[[Hashable], bool] | None:
+        """`skiprows` argument for `pd.read_csv` keeping the header and every n-th row."""
+        if self.sample_step == 1:
+            return None
+        step = self.sample_step
+        # pandas calls it with the row number
+        return lambda i: cast(int, i) % step != 0
+
+    def describe(self) -> str:
+        """Human-readable summary of the decision, suitable for the tool response."""
+        budget = sizeof_fmt(self.budget_bytes)
+        if self.action == "accept":
+            memory = sizeof_fmt(self.cost.memory_bytes)
+            return (
+                f"Admission: accepted ({self.lane} lane, "
+                f"estimated memory {memory} of {budget} budget)"
+            )
+        if self.action == "downgrade":
+            kept = self.effective_cost.rows
+            return (
+                f"Admission: downgraded to one in every {self.sample_step} rows "
+                f"(~{kept:,} of {self.cost.rows:,} rows) to fit the {budget} memory budget "
+                f"({self.lane} lane)"
+            )
+        memory = sizeof_fmt(self.cost.memory_bytes)
+        return (
+            f"Admission: rejected, estimated memory {memory} exceeds the {budget} budget "
+            f"for a {self.cost.plot_type} plot of {self.cost.rows:,} rows. "
+            "Reduce the number of rows or pre-aggregate the data."
+        )
+
+
+def admit(
+    cost: PlotCost, budget_bytes: int | None = None, kwargs: dict | None = None
+) -> AdmissionDecision:
+    """
+    Decide whether a plot request fits the memory budget.
+
+    Requests over budget are downgraded to a regular subsample of their rows when the
+    plot (see `is_downsamplable`, with the plot's `kwargs`) allows it, and rejected
+    otherwise.
+    """
+    if budget_bytes is None:
+        budget_bytes = PLOT_MEMORY_BUDGET_MB * 1024 * 1024
+
+    if cost.memory_bytes <= budget_bytes:
+        return AdmissionDecision("accept", cost, budget_bytes)
+
+    available = budget_bytes - cost.canvas_bytes
+    if is_downsamplable(cost.plot_type, kwargs) and available > 0:
+        step = math.ceil((cost.parse_bytes + cost.render_bytes) / available)
+        if math.ceil(cost.rows / step) >= _MIN_DOWNSAMPLED_ROWS:
+            return AdmissionDecision("downgrade", cost, budget_bytes, sample_step=step)
+
+    return AdmissionDecision("reject", cost, budget_bytes)
+
+
+class RenderScheduler:
+    """
+    Two-lane scheduler bounding the number of concurrent renders.
+
+    Waiting requests in the fast lane are started before waiting requests in the slow
+    lane, except for slow lane requests that have waited longer than `slow_lane_max_wait`
+    seconds, so steady fast traffic cannot starve them. Within a lane, requests are
+    started in arrival order.
+
+    Also keeps the statistics reported by the readiness check: when the running renders
+    started, and the latency (waiting plus rendering) of the requests finished within
+    the last `latency_window` seconds.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = PLOT_MAX_CONCURRENT_RENDERS,
+        latency_window: float = PLOT_LATENCY_WINDOW_SECONDS,
+        slow_lane_max_wait: float = PLOT_SLOW_LANE_MAX_WAIT_SECONDS,
+    ) -> None:
+        self._max_concurrent = max(max_concurrent, 1)
+        self._slow_lane_max_wait = slow_lane_max_wait
+        self._condition = threading.Condition()
+        self._waiting: list[tuple[int, int]] = []
+        # When each waiting request was queued, by ticket
+        self._queued: dict[tuple[int, int], float] = {}
+        self._tickets = itertools.count()
+        self._in_flight = 0
+        # Start time of each running render, by ticket
+        self._started: dict[tuple[int, int], float] = {}
+        self._latency_window = latency_window
+        # (finish time, latency) of recent requests, oldest first
+        self._latencies: deque[tuple[float, float]] = deque(maxlen=_MAX_LATENCY_SAMPLES)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiting)
+
+    @property
+    def longest_render_seconds(self) -> float:
+        """How long the longest running render has been running, 0 when idle."""
+        with self._condition:
+            if not self._started:
+                return 0.0
+            return time.monotonic() - min(self._started.values())
+
+    def latency_percentile(self, percentile: float) -> float | None:
+        """Nearest-rank percentile of the recent request latencies, None without any."""
+        expired = time.monotonic() - self._latency_window
+        with self._condition:
+            while self._latencies and self._latencies[0][0] < expired:
+                self._latencies.popleft()
+            latencies = sorted(latency for _, latency in self._latencies)
+        if not latencies:
+            return None
+        rank = math.ceil(percentile / 100 * len(latencies))
+        return latencies[max(rank, 1) - 1]
+
+    def _next_ticket(self) -> tuple[int, int]:
+        """The oldest overdue slow lane ticket if any, the first in line otherwise."""
+        overdue = time.monotonic() - self._slow_lane_max_wait
+        aged = [
+            ticket for ticket in self._waiting if ticket[0] == 1 and self._queued[ticket] <= overdue
+        ]
+        return min(aged, key=lambda ticket: ticket[1]) if aged else self._waiting[0]
+
+    @contextmanager
+    def slot(self, lane: Lane) -> Iterator[None]:
+        """Block until a render slot is available for `lane`, and hold it."""
+        ticket = (0 if lane == "fast" else 1, next(self._tickets))
+        queued = time.monotonic()
+        # Slow lane requests wake up when they become overdue, even without a notify
+        timeout = self._slow_lane_max_wait if lane == "slow" else None
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            self._queued[ticket] = queued
+            while self._next_ticket() != ticket or self._in_flight >= self._max_concurrent:
+                self._condition.wait(timeout)
+            self._waiting.remove(ticket)
+            heapq.heapify(self._waiting)
+            del self._queued[ticket]
+            self._in_flight += 1
+            self._started[ticket] = time.monotonic()
+            # The next request in line may also fit in a free slot
+            self._condition.notify_all()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                del self._started[ticket]
+                finished = time.monotonic()
+                self._latencies.append((finished, finished - queued))
+                self._condition.notify_all()
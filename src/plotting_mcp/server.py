@@ -1,39 +1,119 @@
 """MCP server for generating plots from CSV data."""
 
 import base64
-import io
+import contextlib
+import functools
 import json
+import threading
 from pathlib import Path
+from typing import Any, AsyncIterator, Callable
 from urllib.request import Request
 
+import anyio
 import click
 import pandas as pd
 import structlog
 import uvicorn
 from mcp.server.fastmcp import FastMCP
 from mcp.types import ImageContent, TextContent
+from starlette.applications import Starlette
 from starlette.responses import JSONResponse, Response
 
-from plotting_mcp.configure_logging import configure_logging
-from plotting_mcp.constants import MCP_PORT
-from plotting_mcp.plot import plot_to_bytes
+from plotting_mcp.cache import DataFrameCache
+from plotting_mcp.configure_logging import LogFormat, configure_logging
+from plotting_mcp.constants import (
+    MCP_PORT,
+    PLOT_ISOLATION,
+    PLOT_MEMORY_BUDGET_MB,
+    PLOT_PREVIEW_MAX_ROWS,
+    PLOT_WARMUP,
+)
+from plotting_mcp.ingest import compaction_bytes, downsample, prepare_dataframe, read_csv
+from plotting_mcp.isolation import run_isolated
+from plotting_mcp.plot import Quality, feature_indices, plot_to_bytes
+from plotting_mcp.readiness import check_readiness
+from plotting_mcp.scheduler import (
+    AdmissionDecision,
+    RenderScheduler,
+    admit,
+    count_csv_rows,
+    estimate_cost,
+    is_downsamplable,
+)
 from plotting_mcp.utils import sizeof_fmt
+from plotting_mcp.warmup import ready, warm_up
 
 logger = structlog.get_logger(__name__)
 
 mcp = FastMCP(name="plotting-mcp", host="0.0.0.0", port=MCP_PORT)
 
+scheduler = RenderScheduler()
+
+# Parsed data of preview renders, for full-quality follow-ups
+data_cache = DataFrameCache()
+
+
+def _in_worker_thread(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a blocking tool so FastMCP awaits it in a worker thread.
+
+    Sync tools are otherwise called directly on the event loop, which serializes every
+    request and leaves nothing for the render scheduler to order.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs))
+
+    return wrapper
+
+
+def _render_plot(
+    csv_data: str,
+    cached_df: pd.DataFrame | None,
+    decision: AdmissionDecision,
+    plot_type: str,
+    quality: Quality,
+    kwargs: dict,
+    keep_data: bool,
+) -> tuple[bytes, pd.DataFrame | None, tuple[int, int, int] | None]:
+    """
+    Parse the CSV data (or sample the cached data) and render the plot.
+
+    Returns the image, the parsed data if `keep_data`, and the rows and sizes before
+    and after compaction of freshly parsed data. Runs in a child process in isolation mode, so
+    it does not log: the child's output is not the server's log, and may be its
+    stdio transport.
+    """
+    compaction = None
+    if cached_df is None:
+        df = read_csv(csv_data, skiprows=decision.skiprows)
+        before, after = compaction_bytes(df)
+        compaction = (len(df), before, after)
+    else:
+        df = cached_df.iloc[:: decision.sample_step]
+    data = df if keep_data else None
+
+    if quality == "preview" and is_downsamplable(plot_type, kwargs):
+        df = downsample(df, PLOT_PREVIEW_MAX_ROWS)
+    df = prepare_dataframe(df, plot_type)
+    return plot_to_bytes(df, plot_type, quality, **kwargs), data, compaction
+
 
-@mcp.tool()
-def generate_plot(
-    csv_data: str, plot_type: str = "line", json_kwargs: str = "None"
+def generate_plot(  # noqa: C901
+    csv_data: str = "",
+    plot_type: str = "line",
+    json_kwargs: str = "None",
+    quality: Quality = "full",
+    handle: str = "None",
 ) -> tuple[TextContent, ImageContent]:
     """
     Generate a plot from CSV data.
 
     Args:
-        csv_data (str): CSV data as a string
-        plot_type (str): Type of plot to generate (line, bar, pie, worldmap).
+        csv_data (str): CSV data as a string. Can be left empty when `handle` is given.
+        plot_type (str): Type of plot to generate (line, bar, pie, worldmap, histogram,
+         heatmap, box).
          If not specified, defaults to "line".
         json_kwargs (str, optional): JSON string with additional parameters for the plot.
             If not specified, the plot will be generated with default parameters.
@@ -43,6 +123,15 @@ def generate_plot(
                 - `x` (str): Column name for x-axis
                 - `y` (str): Column name for y-axis
                 - `hue` (str): Column name for color encoding
+            Histogram, heatmap and box plots are computed on the server, so send raw rows
+            rather than pre-aggregated data. Their cost depends on the number of bins:
+                - histogram: `x` (numeric column, default: the first numeric column),
+                  `bins` (int, default: 30), `range` ([min, max]), `density` (bool)
+                - heatmap: counts per cell of `x` and `y` (numeric columns, default: the
+                  first two numeric columns), `bins` (int or [x_bins, y_bins], default: 50),
+                  `cmap` (str)
+                - box: quartiles of `y` (numeric column, default: the first numeric
+                  column), with one box per group of the optional `x` column
             For worldmap plots, coordinate data is expected with latitude/longitude columns:
                 - Latitude columns: lat, latitude, y
                 - Longitude columns: lon, lng, long, longitude, x
@@ -50,11 +139,25 @@ def generate_plot(
                 - `c` (str): marker color (default: 'red')
                 - `alpha` (float): transparency (default: 0.7). Between 0 and 1.
                 - `marker` (str): marker style (default: 'o')
+                - `extent` (str | list): 'global' or [lon_min, lon_max, lat_min, lat_max].
+                  By default the map is fitted to the points.
+        quality (str, optional): "full" (default) or "preview". A preview is a quick,
+            low-resolution draft of downsampled data, and its response contains a handle
+            to the parsed data.
+        handle (str, optional): Handle returned by a preview. Renders the data of that
+            preview again, with this call's plot_type, json_kwargs and quality, without
+            sending the CSV data again.
+
+    Large requests may be downsampled to fit the server's memory budget, or rejected
+    when that is not possible. The response text reports the admission decision.
 
     Returns:
         tuple[TextContent, ImageContent]: A tuple containing a success message and the
         generated plot as an image.
     """
+    if quality not in ("preview", "full"):
+        raise ValueError(f"Unsupported quality: {quality}. Supported values: preview, full")
+
     if json_kwargs != "None":
         try:
             kwargs = json.loads(json_kwargs)
@@ -64,19 +167,82 @@ def generate_plot(
     else:
         kwargs = {}
 
-    try:
-        df = pd.read_csv(io.StringIO(csv_data))
+    if handle != "None":
+        cached_df = data_cache.get(handle)
+        if cached_df is None:
+            raise ValueError(f"Unknown or expired plot handle: {handle}. Send the CSV data again.")
+        # Already parsed, only rendering is left to pay for
+        cost = estimate_cost(plot_type, len(cached_df), 0)
+    else:
+        cached_df = None
+        cost = estimate_cost(plot_type, count_csv_rows(csv_data), len(csv_data))
 
-        plot_bytes = plot_to_bytes(df, plot_type, **kwargs)
+    # Data kept for follow-ups and loaded map features take their share of the budget
+    retained_bytes = data_cache.nbytes + feature_indices.nbytes
+    budget_bytes = max(PLOT_MEMORY_BUDGET_MB * 1024 * 1024 - retained_bytes, 0)
+    decision = admit(cost, budget_bytes=budget_bytes, kwargs=kwargs)
+    if decision.action == "reject":
+        logger.warning(
+            "Plot request rejected",
+            plot_type=plot_type,
+            rows=cost.rows,
+            memory=sizeof_fmt(cost.memory_bytes),
+        )
+        raise ValueError(decision.describe())
+
+    render = run_isolated if PLOT_ISOLATION else lambda fn, *args: fn(*args)
+    try:
+        with scheduler.slot(decision.lane):
+            plot_bytes, data, compaction = render(
+                _render_plot,
+                csv_data,
+                cached_df,
+                decision,
+                plot_type,
+                quality,
+                kwargs,
+                # Downgraded data is incomplete, a full render of it would be misleading
+                quality == "preview" and handle == "None" and decision.sample_step == 1,
+            )
+        if compaction is not None:
+            rows, before, after = compaction
+            logger.info(
+                "Data compacted",
+                rows=rows,
+                before=sizeof_fmt(before),
+                after=sizeof_fmt(after),
+            )
+        if data is not None:
+            handle = data_cache.put(data) or "None"
 
         logger.info(
             "Plot generated successfully",
             plot_type=plot_type,
             kwargs=kwargs,
+            quality=quality,
             size=sizeof_fmt(len(plot_bytes)),
+            admission=decision.action,
+            lane=decision.lane,
         )
+        if quality == "preview":
+            if handle != "None":
+                follow_up = (
+                    f"Preview handle: {handle}. Call generate_plot with handle={handle} "
+                    'and quality="full" to render the full-quality plot without sending '
+                    "the CSV data again."
+                )
+            elif decision.sample_step > 1:
+                follow_up = (
+                    "The data was downsampled to fit the memory budget, so it is not kept. "
+                    "Send fewer rows for a complete full-quality render."
+                )
+            else:
+                follow_up = "The data is too large to keep, send it again for a full render."
+            text = f"Preview generated successfully\n{decision.describe()}\n{follow_up}"
+        else:
+            text = f"Plot generated successfully\n{decision.describe()}"
         return (
-            TextContent(type="text", text="Plot generated successfully"),
+            TextContent(type="text", text=text),
             ImageContent(
                 type="image",
                 data=base64.b64encode(plot_bytes).decode(),
@@ -88,15 +254,44 @@ def generate_plot(
         raise
 
 
+mcp.add_tool(_in_worker_thread(generate_plot))
+
+
 # Health check endpoint
 @mcp.custom_route("/", methods=["GET"])
 def health_check(request: Request) -> Response:
     return JSONResponse({"status": "ok"})
 
 
+# Readiness endpoint, fails while the server is saturated so new sessions go elsewhere
+@mcp.custom_route("/ready", methods=["GET"])
+def readiness_check(request: Request) -> Response:
+    if not ready.is_set():
+        return JSONResponse({"status": "warming up"}, status_code=503)
+    report = check_readiness(scheduler)
+    if not report.ready:
+        logger.warning("Server saturated", reasons=report.reasons)
+    return JSONResponse(report.as_dict(), status_code=200 if report.ready else 503)
+
+
 # Have to do it this way to conform the string expected by uvicorn.run
 # Expected format: "<module>:<attribute>"
 starlette_app = mcp.streamable_http_app()
+_session_lifespan = starlette_app.router.lifespan_context
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(app: Starlette) -> AsyncIterator[None]:
+    """Run the MCP session manager, and warm up rendering in the background."""
+    async with _session_lifespan(app):
+        if PLOT_WARMUP:
+            threading.Thread(target=warm_up, args=(scheduler,), name="warm-up", daemon=True).start()
+        else:
+            ready.set()
+        yield
+
+
+starlette_app.router.lifespan_context = _lifespan
 
 
 @click.command()
@@ -106,6 +301,12 @@ starlette_app = mcp.streamable_http_app()
     type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]),
     help="Set the logging level (default: INFO)",
 )
+@click.option(
+    "--log-format",
+    default=None,
+    type=click.Choice(["console", "json"]),
+    help="Log output format (default: console with --reload, json otherwise)",
+)
 @click.option(
     "--reload",
     is_flag=True,
@@ -117,9 +318,16 @@ starlette_app = mcp.streamable_http_app()
     type=click.Choice(["stdio", "http"]),
     help="Transport type for the MCP server (default: http)",
 )
-def main(log_level: str = "INFO", reload: bool = False, transport: str = "http") -> None:
+def main(
+    log_level: str = "INFO",
+    log_format: LogFormat | None = None,
+    reload: bool = False,
+    transport: str = "http",
+) -> None:
     """Main entry point for the MCP server."""
-    logging_dict = configure_logging(log_level=log_level)
+    if log_format is None:
+        log_format = "console" if reload else "json"
+    logging_dict = configure_logging(log_level=log_level, log_format=log_format)
 
     if transport == "stdio":
         mcp.run("stdio")
@@ -0,0 +1,82 @@
+"""Warm-up of the rendering path before the server reports ready."""
+
+import threading
+import time
+from typing import Callable
+
+import pandas as pd
+import structlog
+
+from plotting_mcp.constants import PLOT_ISOLATION
+from plotting_mcp.ingest import prepare_dataframe
+from plotting_mcp.isolation import run_isolated
+from plotting_mcp.plot import plot_to_bytes
+from plotting_mcp.scheduler import RenderScheduler
+
+logger = structlog.get_logger(__name__)
+
+# Set once the warm-up has finished, see `readiness_check` in `plotting_mcp.server`
+ready = threading.Event()
+
+
+def _line_data() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "time": ["2024-01-01", "2024-01-02", "2024-01-03"] * 2,
+            "step": [1, 2, 3] * 2,
+            "value": [1.0, 3.0, 2.0, 2.0, 1.0, 3.0],
+            "series": ["a"] * 3 + ["b"] * 3,
+        }
+    )
+
+
+def _bar_data() -> pd.DataFrame:
+    return pd.DataFrame({"category": ["A", "B", "C"], "value": [3, 1, 2]})
+
+
+def _worldmap_data() -> pd.DataFrame:
+    # Spread over the globe, so only the smallest scale of map features is loaded
+    return pd.DataFrame({"lat": [-33.9, 51.5, 35.7], "lon": [18.4, -0.1, 139.7]})
+
+
+# (plot_type, data, kwargs), covering the code paths hit by the first requests:
+# date parsing and seaborn (dates are left to seaborn), the native line renderer
+# (numeric x), pie labels, the aggregating plots and cartopy features
+WARMUP_PLOTS: list[tuple[str, Callable[[], pd.DataFrame], dict]] = [
+    ("line", _line_data, {"x": "time", "y": "value", "hue": "series", "title": "Warm-up"}),
+    ("line", _line_data, {"x": "step", "y": "value", "hue": "series"}),
+    ("bar", _bar_data, {"x": "category", "y": "value"}),
+    ("pie", _bar_data, {}),
+    ("histogram", _bar_data, {}),
+    ("heatmap", _worldmap_data, {}),
+    ("box", _bar_data, {}),
+    ("worldmap", _worldmap_data, {}),
+]
+
+
+def warm_up(scheduler: RenderScheduler) -> None:
+    """
+    Render one throwaway plot of each type, then set `ready`.
+
+    The first render in a process pays for font discovery, FreeType loading, glyph
+    caching and loading the map features. Renders go through the scheduler so they
+    never overlap with requests. Failures are logged and do not block readiness.
+
+    In isolation mode, renders run in children of a fork server instead, so only the
+    fork server is started, which warms itself up (see `plotting_mcp.preload`).
+    """
+    start = time.perf_counter()
+    if PLOT_ISOLATION:
+        try:
+            run_isolated(len, "")
+        except Exception:
+            logger.warning("Starting the render fork server failed", exc_info=True)
+    else:
+        for plot_type, data, kwargs in WARMUP_PLOTS:
+            try:
+                with scheduler.slot("fast"):
+                    plot_to_bytes(prepare_dataframe(data(), plot_type), plot_type, **kwargs)
+            except Exception:
+                logger.warning("Warm-up plot failed", plot_type=plot_type, exc_info=True)
+    ready.set()
+    logger.info("Warm-up finished", duration=f"{time.perf_counter() - start:.2f}s")
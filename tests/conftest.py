@@ -1,9 +1,135 @@
 """Pytest configuration and shared fixtures."""
 
+from pathlib import Path
+
 import matplotlib
+import numpy as np
+import pytest
+import shapefile
+import shapely
+from cartopy.io import shapereader
+from shapely.geometry.polygon import orient
+
+from plotting_mcp import plot
+
+# Rows of the fast path parity report, see `tests/test_golden.py`
+parity_report_key = pytest.StashKey[list]()
+
+# Continents of the synthetic Natural Earth data as (lon, lat, lon radius, lat radius).
+# The first reaches Cape Town (18.4, -33.9), so city maps there show a coastline.
+_CONTINENTS = [
+    (15.0, 0.0, 25.0, 36.0),
+    (100.0, 50.0, 55.0, 20.0),
+    (-95.0, 40.0, 30.0, 22.0),
+    (-60.0, -15.0, 20.0, 25.0),
+    (135.0, -25.0, 18.0, 12.0),
+]
+
+# Vertices per continent outline at each scale, like the level of detail of the real data
+_SCALE_VERTICES = {"110m": 64, "50m": 512, "10m": 4096}
+
+
+def pytest_addoption(parser):
+    """Add custom command line options."""
+    parser.addoption(
+        "--update-golden",
+        action="store_true",
+        default=False,
+        help="Regenerate the reference images of the golden image tests",
+    )
 
 
 def pytest_configure(config):
     """Configure pytest with custom settings."""
     # Use non-interactive backend for matplotlib to avoid GUI issues in tests
     matplotlib.use("Agg")
+    config.stash[parity_report_key] = []
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report the speedup and image delta of each optimized rendering path."""
+    rows = config.stash.get(parity_report_key, [])
+    if not rows:
+        return
+    terminalreporter.section("fast path parity")
+    terminalreporter.write_line(
+        f"{'path':<28} {'reference':>10} {'optimized':>10} {'speedup':>8} {'RMS':>7}"
+    )
+    for name, reference, optimized, rms in rows:
+        terminalreporter.write_line(
+            f"{name:<28} {reference:>9.3f}s {optimized:>9.3f}s "
+            f"{reference / optimized:>7.1f}x {rms:>7.3f}"
+        )
+
+
+def _continent(lon: float, lat: float, lon_radius: float, lat_radius: float, vertices: int):
+    """A deterministic wiggly ellipse, with finer wiggles at more vertices."""
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    wiggle = 1 + 0.06 * np.sin(5 * angles) + 0.03 * np.sin(17 * angles + lon)
+    wiggle += 0.01 * np.sin(vertices / 16 * angles)
+    return shapely.Polygon(
+        np.column_stack(
+            [lon + lon_radius * wiggle * np.cos(angles), lat + lat_radius * wiggle * np.sin(angles)]
+        )
+    )
+
+
+def _write_natural_earth(directory: Path, scale: str) -> None:
+    """
+    Write the synthetic ocean, land, coastline and boundary layers of one scale.
+
+    Like the real data, land is a single multipolygon record and ocean a single polygon
+    with the continents as holes.
+    """
+    continents = [_continent(*continent, _SCALE_VERTICES[scale]) for continent in _CONTINENTS]
+    land = shapely.MultiPolygon(shapely.get_parts(shapely.union_all(continents)))
+    ocean = shapely.box(-180, -90, 180, 90).difference(land)
+    # Borders across the first two continents
+    boundaries = shapely.MultiLineString([[(20, -30), (20, 30)], [(60, 30), (110, 60)]])
+
+    def write(name: str, shape_type: int, geometries: list) -> None:
+        with shapefile.Writer(directory / f"ne_{scale}_{name}", shapeType=shape_type) as writer:
+            writer.field("featurecla", "C")
+            for geometry in geometries:
+                writer.shape(geometry.__geo_interface__)
+                writer.record(name)
+
+    # Shapefiles store exteriors clockwise
+    write("land", shapefile.POLYGON, [shapely.MultiPolygon([orient(p, -1) for p in land.geoms])])
+    write("ocean", shapefile.POLYGON, [orient(ocean, -1)])
+    write("coastline", shapefile.POLYLINE, list(land.boundary.geoms))
+    write("admin_0_boundary_lines_land", shapefile.POLYLINE, [boundaries])
+
+
+@pytest.fixture(scope="session")
+def natural_earth_dir(tmp_path_factory):
+    """Directory of synthetic Natural Earth shapefiles at every scale."""
+    directory = tmp_path_factory.mktemp("natural_earth")
+    for scale in _SCALE_VERTICES:
+        _write_natural_earth(directory, scale)
+    return directory
+
+
+@pytest.fixture
+def natural_earth(natural_earth_dir, monkeypatch):
+    """Serve the synthetic Natural Earth shapefiles, so world maps render offline."""
+
+    def natural_earth(resolution="110m", category="physical", name="coastline"):
+        return str(natural_earth_dir / f"ne_{resolution}_{name}.shp")
+
+    monkeypatch.setattr(shapereader, "natural_earth", natural_earth)
+    plot.feature_indices.clear()
+    yield natural_earth_dir
+    plot.feature_indices.clear()
+
+
+@pytest.fixture
+def update_golden(request):
+    """Whether golden image references should be regenerated instead of compared."""
+    return request.config.getoption("--update-golden")
+
+
+@pytest.fixture
+def parity_report(request):
+    """Rows of (path, reference seconds, optimized seconds, RMS) for the summary."""
+    return request.config.stash[parity_report_key]
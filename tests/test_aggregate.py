@@ -0,0 +1,109 @@
+"""Tests for the summaries of the aggregating plot types."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib import cbook
+
+from plotting_mcp.aggregate import (
+    box_stats,
+    grouped_box_stats,
+    histogram,
+    histogram2d,
+    numeric_values,
+    quantiles,
+)
+
+
+class TestHistogram:
+    """Test the histogram and histogram2d functions."""
+
+    def test_chunked_histogram_matches_numpy(self):
+        """Test that counting in chunks gives the same counts and edges as NumPy."""
+        values = np.random.default_rng(0).normal(size=10_001)
+
+        counts, edges = histogram(values, bins=20, chunk_rows=1_000)
+        expected_counts, expected_edges = np.histogram(values, bins=20)
+
+        np.testing.assert_array_equal(counts, expected_counts)
+        np.testing.assert_allclose(edges, expected_edges)
+
+    def test_histogram_constant_values(self):
+        """Test that a single distinct value gets a range around it, like NumPy."""
+        counts, edges = histogram(np.full(5, 3), bins=4)
+
+        assert counts.sum() == 5
+        np.testing.assert_allclose(edges, np.histogram(np.full(5, 3), bins=4)[1])
+
+    def test_histogram_infinite_values(self):
+        """Test that infinite values are rejected."""
+        with pytest.raises(ValueError, match="infinite"):
+            histogram(np.array([1.0, np.inf]), bins=4)
+
+    def test_chunked_histogram2d_matches_numpy(self):
+        """Test that counting pairs in chunks gives the same grid as NumPy."""
+        rng = np.random.default_rng(1)
+        x, y = rng.normal(size=5_000), rng.exponential(size=5_000)
+
+        counts, x_edges, y_edges = histogram2d(x, y, bins=(8, 6), chunk_rows=700)
+        expected, expected_x, expected_y = np.histogram2d(x, y, bins=(8, 6))
+
+        np.testing.assert_array_equal(counts, expected)
+        np.testing.assert_allclose(x_edges, expected_x)
+        np.testing.assert_allclose(y_edges, expected_y)
+
+
+class TestBoxStats:
+    """Test the quantiles, box_stats and grouped_box_stats functions."""
+
+    def test_quantiles_match_numpy(self):
+        """Test that partition-based quantiles interpolate like np.quantile."""
+        values = np.random.default_rng(2).integers(0, 100, size=101)
+        qs = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+        np.testing.assert_allclose(quantiles(values, qs), np.quantile(values, qs))
+
+    def test_box_stats_match_matplotlib(self):
+        """Test that the box summary matches matplotlib's boxplot statistics."""
+        values = np.random.default_rng(3).standard_t(df=3, size=1_000)
+        expected = cbook.boxplot_stats(values)[0]
+
+        stats = box_stats(values)
+
+        for key in ("q1", "med", "q3", "whislo", "whishi"):
+            assert getattr(stats, key) == pytest.approx(expected[key])
+        np.testing.assert_allclose(stats.fliers, np.sort(expected["fliers"]))
+
+    def test_box_stats_limits_fliers(self):
+        """Test that the number of outliers drawn is bounded, keeping the extremes."""
+        values = np.concatenate([np.zeros(10_000), np.arange(1, 1_001) * 100.0])
+
+        stats = box_stats(values)
+
+        assert len(stats.fliers) == 200
+        assert stats.fliers[-1] == 100_000.0
+
+    def test_grouped_box_stats_in_order_of_appearance(self):
+        """Test that groups are summarized separately, in order of appearance."""
+        values = np.array([5.0, 1.0, 6.0, 2.0, 7.0, 3.0])
+        groups = pd.Series(["b", "a", "b", "a", "b", "a"])
+
+        stats = grouped_box_stats(values, groups)
+
+        assert [box.label for box in stats] == ["b", "a"]
+        assert [box.med for box in stats] == [6.0, 2.0]
+
+
+class TestNumericValues:
+    """Test the numeric_values function."""
+
+    def test_numeric_values(self):
+        """Test that numeric and boolean columns are returned and others rejected."""
+        df = pd.DataFrame({"n": [1, 2], "b": [True, False], "s": ["a", "b"]})
+
+        np.testing.assert_array_equal(numeric_values(df, "n"), [1, 2])
+        np.testing.assert_array_equal(numeric_values(df, "b"), [1.0, 0.0])
+        with pytest.raises(ValueError, match="must be numeric"):
+            numeric_values(df, "s")
+        with pytest.raises(ValueError, match="not found"):
+            numeric_values(df, "missing")
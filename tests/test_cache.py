@@ -0,0 +1,41 @@
+"""Tests for the parsed data cache."""
+
+import pandas as pd
+
+from plotting_mcp.cache import DataFrameCache
+
+
+class TestDataFrameCache:
+    """Test the DataFrameCache class."""
+
+    def test_put_and_get(self):
+        """Test that a stored DataFrame is returned by its handle."""
+        cache = DataFrameCache(max_entries=2, max_bytes=1024 * 1024)
+        df = pd.DataFrame({"x": [1, 2, 3]})
+
+        handle = cache.put(df)
+
+        assert handle is not None
+        assert cache.get(handle) is df
+        assert cache.get("unknown") is None
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = DataFrameCache(max_entries=2, max_bytes=1024 * 1024)
+        first = cache.put(pd.DataFrame({"x": [1]}))
+        second = cache.put(pd.DataFrame({"x": [2]}))
+        cache.get(first)
+
+        third = cache.put(pd.DataFrame({"x": [3]}))
+
+        assert len(cache) == 2
+        assert cache.get(second) is None
+        assert cache.get(first) is not None
+        assert cache.get(third) is not None
+
+    def test_rejects_dataframes_larger_than_cache(self):
+        """Test that a DataFrame larger than the whole cache is not stored."""
+        cache = DataFrameCache(max_entries=2, max_bytes=100)
+
+        assert cache.put(pd.DataFrame({"x": range(1000)})) is None
+        assert len(cache) == 0
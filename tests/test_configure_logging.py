@@ -0,0 +1,115 @@
+"""Tests for logging configuration."""
+
+import json
+import logging
+
+import pytest
+import structlog
+
+from plotting_mcp import configure_logging as configure_logging_module
+from plotting_mcp.configure_logging import (
+    FieldTruncator,
+    SamplingFilter,
+    configure_logging,
+    parse_sample_rates,
+)
+
+
+def _record(name: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, "message", None, None)
+
+
+class TestSamplingFilter:
+    """Test the SamplingFilter class."""
+
+    def test_keeps_fraction_of_sampled_logger(self):
+        """Test that the configured fraction of records is kept, starting with the first."""
+        sampling = SamplingFilter({"uvicorn.access": 0.25})
+
+        kept = [sampling.filter(_record("uvicorn.access")) for _ in range(8)]
+
+        assert kept == [True, False, False, False, True, False, False, False]
+
+    def test_applies_to_child_loggers_only(self):
+        """Test that rates apply to child loggers but not to unrelated loggers."""
+        sampling = SamplingFilter({"uvicorn": 0.0})
+
+        assert sampling.filter(_record("uvicorn.access"))
+        assert not sampling.filter(_record("uvicorn.access"))
+        assert all(sampling.filter(_record("plotting_mcp.server")) for _ in range(3))
+
+    def test_always_keeps_warnings(self):
+        """Test that warnings and errors are never sampled out."""
+        sampling = SamplingFilter({"noisy": 0.0})
+        sampling.filter(_record("noisy"))
+
+        assert sampling.filter(_record("noisy", logging.WARNING))
+        assert sampling.filter(_record("noisy", logging.ERROR))
+
+
+class TestParseSampleRates:
+    """Test the parse_sample_rates function."""
+
+    def test_parse_sample_rates(self):
+        """Test parsing of comma-separated logger=rate pairs."""
+        assert parse_sample_rates("") == {}
+        assert parse_sample_rates("uvicorn.access=0.1, plotting_mcp=1") == {
+            "uvicorn.access": 0.1,
+            "plotting_mcp": 1.0,
+        }
+
+    def test_parse_sample_rates_invalid(self):
+        """Test that rates outside [0, 1] or without a logger are rejected."""
+        with pytest.raises(ValueError, match="Invalid log sample rate"):
+            parse_sample_rates("uvicorn.access=2")
+        with pytest.raises(ValueError, match="Invalid log sample rate"):
+            parse_sample_rates("0.5")
+
+
+class TestFieldTruncator:
+    """Test the FieldTruncator processor."""
+
+    def test_truncates_long_fields(self):
+        """Test that long values are truncated and short or numeric values are kept."""
+        truncate = FieldTruncator(max_length=10)
+        event_dict = {
+            "event": "Plot generated successfully",
+            "kwargs": {"x": "x", "y": "y"},
+            "rows": 1_000_000_000_000,
+            "plot_type": "line",
+            "exception": "Traceback" * 10,
+        }
+
+        result = truncate(None, "info", event_dict)
+
+        assert result["event"] == "Plot gener... (27 chars)"
+        assert result["kwargs"] == "{'x': 'x',... (20 chars)"
+        assert result["rows"] == 1_000_000_000_000
+        assert result["plot_type"] == "line"
+        assert result["exception"] == "Traceback" * 10
+
+
+class TestConfigureLogging:
+    """Test the configure_logging function."""
+
+    def test_json_logging_through_queue(self, capsys):
+        """Test that JSON mode writes one JSON object per record from the listener."""
+        logging_dict = configure_logging(log_level="INFO", log_format="json")
+        try:
+            # uvicorn applies the returned configuration a second time
+            logging.config.dictConfig(logging_dict)
+            structlog.get_logger("test.json").info("Hello", plot_type="line")
+            logging.getLogger("test.foreign").warning("Foreign %s", "record")
+        finally:
+            configure_logging_module._stop_listener()
+            configure_logging(log_level="INFO")
+
+        lines = capsys.readouterr().err.strip().splitlines()
+        records = [json.loads(line) for line in lines]
+
+        assert records[0]["event"] == "Hello"
+        assert records[0]["plot_type"] == "line"
+        assert records[0]["logger"] == "test.json"
+        assert records[1]["event"] == "Foreign record"
+        assert records[1]["level"] == "warning"
+        assert records[1]["timestamp"].endswith("Z")
@@ -0,0 +1,254 @@
+"""
+Golden image tests for the rendered plots.
+
+Every case is rendered through the same path as the server and compared to a stored
+reference PNG in `tests/golden/` by RMS difference. Run `pytest --update-golden` to
+regenerate the references after an intended change in the output. World maps are drawn
+from the synthetic Natural Earth data of the `natural_earth` fixture.
+
+The parity tests render with each optimized code path and with the plain path it
+replaces, and report the speedup and image delta in the test summary.
+"""
+
+import io
+import os
+import statistics
+import time
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Callable
+from unittest import mock
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib.testing.compare import calculate_rms, compare_images
+
+from plotting_mcp import plot
+from plotting_mcp.ingest import compact_dataframe, prepare_dataframe
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+
+# Maximum RMS difference (0-255 scale) to a reference image, or between paths
+GOLDEN_TOLERANCE = float(os.getenv("GOLDEN_IMAGE_TOLERANCE", 1.0))
+
+# Timing repetitions for the parity report, the median is reported
+PARITY_REPEAT = int(os.getenv("PARITY_REPEAT", 3))
+
+
+def _walk(rows: int, seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=rows).cumsum().round(3)
+
+
+def _line() -> pd.DataFrame:
+    return pd.DataFrame({"x": np.arange(50), "y": _walk(50, seed=1)})
+
+
+def _line_hue(groups: int = 5) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "x": np.tile(np.arange(40), groups),
+            "y": _walk(40 * groups, seed=2),
+            "series": np.repeat([f"series {i}" for i in range(groups)], 40),
+        }
+    )
+
+
+def _line_aggregated() -> pd.DataFrame:
+    # Several values per x, drawn by seaborn as mean and confidence band
+    return pd.DataFrame({"x": np.repeat(np.arange(20), 5), "y": _walk(100, seed=3)})
+
+
+def _line_datetime() -> pd.DataFrame:
+    times = pd.date_range("2024-01-01", periods=72, freq="h")
+    return pd.DataFrame({"time": times.strftime("%Y-%m-%dT%H:%M:%S"), "value": _walk(72, seed=4)})
+
+
+def _bar() -> pd.DataFrame:
+    return pd.DataFrame({"category": ["A", "B", "C", "D", "E"], "value": [10, 15, 8, 12, 5]})
+
+
+def _bar_hue() -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    return pd.DataFrame(
+        {
+            "category": np.tile(["A", "B", "C", "D"], 30),
+            "group": np.repeat(["first", "second", "third"], 40),
+            "value": rng.integers(0, 100, size=120),
+        }
+    )
+
+
+def _bar_totals() -> pd.DataFrame:
+    # Enough rows per bar for reducing them to one row per bar to show in the timings
+    rng = np.random.default_rng(8)
+    return pd.DataFrame(
+        {
+            "category": rng.choice(["A", "B", "C", "D", "E", "F"], size=50_000),
+            "group": rng.choice(["first", "second", "third"], size=50_000),
+            "value": rng.integers(0, 100, size=50_000),
+        }
+    )
+
+
+def _pie_counts() -> pd.DataFrame:
+    return pd.DataFrame({"browser": ["Firefox", "Chrome", "Chrome", "Safari", "Chrome", "Edge"]})
+
+
+def _pie_breakdown() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "version": ["0.2.0", "0.1.8", "0.1.5", "0.1.9", "0.2.1"],
+            "event_count": [2083, 1298, 1267, 537, 533],
+        }
+    )
+
+
+def _distribution() -> pd.DataFrame:
+    rng = np.random.default_rng(6)
+    return pd.DataFrame(
+        {
+            "group": rng.choice(["north", "south", "east"], size=2_000),
+            "x": rng.normal(size=2_000).round(3),
+            "y": rng.gamma(2.0, size=2_000).round(3),
+        }
+    )
+
+
+def _worldmap_city() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "lat": [-33.941, -33.942, -33.941, -33.936, -33.944],
+            "long": [18.467, 18.468, 18.467, 18.467, 18.470],
+        }
+    )
+
+
+def _worldmap_global() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "lat": [-33.9, 51.5, 40.7, 35.7, -23.5, 1.3],
+            "lon": [18.4, -0.1, -74.0, 139.7, -46.6, 103.8],
+        }
+    )
+
+
+# name: (plot_type, data, kwargs)
+GOLDEN_CASES: dict[str, tuple[str, Callable[[], pd.DataFrame], dict]] = {
+    "line": ("line", _line, {"x": "x", "y": "y", "title": "Line"}),
+    "line_hue": ("line", _line_hue, {"x": "x", "y": "y", "hue": "series"}),
+    # Confidence bands are bootstrapped, seeded for reproducible images
+    "line_aggregated": ("line", _line_aggregated, {"x": "x", "y": "y", "seed": 0}),
+    "line_datetime": ("line", _line_datetime, {"x": "time", "y": "value"}),
+    "bar": ("bar", _bar, {"x": "category", "y": "value", "xlabel": "Category"}),
+    "bar_hue": ("bar", _bar_hue, {"x": "category", "y": "value", "hue": "group", "seed": 0}),
+    # No error bars, so the data is reduced to one row per bar before seaborn draws it
+    "bar_totals": (
+        "bar",
+        _bar_totals,
+        {"x": "category", "y": "value", "hue": "group", "errorbar": None, "estimator": "sum"},
+    ),
+    "pie_counts": ("pie", _pie_counts, {}),
+    "pie_breakdown": ("pie", _pie_breakdown, {}),
+    "histogram": ("histogram", _distribution, {"x": "y", "bins": 40}),
+    "heatmap": ("heatmap", _distribution, {"x": "x", "y": "y", "bins": [30, 20]}),
+    "box": ("box", _distribution, {"x": "group", "y": "y"}),
+    "worldmap_city": ("worldmap", _worldmap_city, {}),
+    "worldmap_global": ("worldmap", _worldmap_global, {"c": "blue"}),
+}
+
+
+def _render(case: str, **overrides) -> bytes:
+    """Render a golden case the way the server does."""
+    plot_type, data, kwargs = GOLDEN_CASES[case]
+    df = prepare_dataframe(compact_dataframe(data()), plot_type)
+    return plot.plot_to_bytes(df, plot_type, **{**kwargs, **overrides})
+
+
+def _decode(png: bytes) -> np.ndarray:
+    return plt.imread(io.BytesIO(png), format="png")
+
+
+def _timed_render(case: str) -> float:
+    start = time.perf_counter()
+    _render(case)
+    return time.perf_counter() - start
+
+
+@pytest.mark.usefixtures("natural_earth")
+class TestGoldenImages:
+    """Compare every plot type against stored reference images."""
+
+    @pytest.mark.parametrize("case", GOLDEN_CASES)
+    def test_matches_reference(self, case, tmp_path, update_golden):
+        """Test that the rendered plot matches its reference image."""
+        expected = GOLDEN_DIR / f"{case}.png"
+        png = _render(case)
+
+        if update_golden:
+            GOLDEN_DIR.mkdir(exist_ok=True)
+            expected.write_bytes(png)
+            pytest.skip(f"Updated reference image {expected.name}")
+        if not expected.exists():
+            pytest.fail(f"No reference image {expected.name}, run pytest --update-golden")
+
+        actual = tmp_path / expected.name
+        actual.write_bytes(png)
+        # Leaves a diff image next to the actual image on failure
+        result = compare_images(str(expected), str(actual), tol=GOLDEN_TOLERANCE)
+        assert result is None, result
+
+
+def _seaborn_line_plot() -> AbstractContextManager:
+    return mock.patch.object(plot, "_create_fast_line_plot", return_value=False)
+
+
+def _unaggregated_bar_data() -> AbstractContextManager:
+    return mock.patch.object(plot, "_aggregate_bar_data", lambda df, **kwargs: df)
+
+
+def _unclipped_map_features() -> AbstractContextManager:
+    def unclipped(category, name, scale, extent):
+        return plot._load_feature_index(category, name, scale).geometries
+
+    return mock.patch.object(plot, "_clip_feature_geometries", unclipped)
+
+
+# name: (golden case, context manager replacing the optimized path by the plain one)
+FAST_PATHS: dict[str, tuple[str, Callable[[], AbstractContextManager]]] = {
+    "native line renderer": ("line_hue", _seaborn_line_plot),
+    "aggregated bar data": ("bar_totals", _unaggregated_bar_data),
+    "clipped map features": ("worldmap_city", _unclipped_map_features),
+}
+
+
+@pytest.mark.usefixtures("natural_earth")
+class TestFastPathParity:
+    """Compare optimized rendering paths with the paths they replace."""
+
+    @pytest.mark.parametrize("name", FAST_PATHS)
+    def test_optimized_path_matches_reference_path(self, name, parity_report):
+        """Test that an optimized path renders the same image as the reference path."""
+        case, reference_path = FAST_PATHS[name]
+
+        # Untimed first renders warm up caches that either path would fill
+        optimized_png = _render(case)
+        with reference_path():
+            reference_png = _render(case)
+        # Alternated, so that neither path is timed in a colder state than the other
+        optimized_times, reference_times = [], []
+        for _ in range(PARITY_REPEAT):
+            optimized_times.append(_timed_render(case))
+            with reference_path():
+                reference_times.append(_timed_render(case))
+        optimized_time = statistics.median(optimized_times)
+        reference_time = statistics.median(reference_times)
+
+        optimized, reference = _decode(optimized_png), _decode(reference_png)
+        assert optimized.shape == reference.shape
+        # Same 0-255 scale as compare_images
+        rms = calculate_rms(reference * 255, optimized * 255)
+        parity_report.append((name, reference_time, optimized_time, rms))
+
+        assert rms <= GOLDEN_TOLERANCE
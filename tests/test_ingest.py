@@ -0,0 +1,149 @@
+"""Tests for CSV ingestion."""
+
+import numpy as np
+import pandas as pd
+
+from plotting_mcp.ingest import (
+    compact_dataframe,
+    compaction_bytes,
+    downsample,
+    parse_datetime_columns,
+    prepare_dataframe,
+    read_csv,
+)
+
+
+class TestParseDatetimeColumns:
+    """Test the parse_datetime_columns function."""
+
+    def test_parses_iso_dates_and_timestamps(self):
+        """Test that ISO dates and timestamps become datetime64 columns."""
+        df = pd.DataFrame(
+            {
+                "date": ["2024-01-01", "2024-01-02", "2024-01-03"],
+                "time": ["2024-01-01T10:00:00", "2024-01-01T10:00:01", "2024-01-01T10:00:02"],
+                "value": [1, 2, 3],
+            }
+        )
+
+        result = parse_datetime_columns(df)
+
+        assert pd.api.types.is_datetime64_dtype(result["date"])
+        assert pd.api.types.is_datetime64_dtype(result["time"])
+        assert result["time"].iloc[2] == pd.Timestamp("2024-01-01 10:00:02")
+        assert pd.api.types.is_integer_dtype(result["value"])
+
+    def test_timezone_offsets_converted_to_utc(self):
+        """Test that timestamps with offsets are parsed as UTC."""
+        df = pd.DataFrame({"time": ["2024-01-01T00:00:00Z", "2024-01-01T02:00:00+02:00"]})
+
+        result = parse_datetime_columns(df)
+
+        assert str(result["time"].dt.tz) == "UTC"
+        assert result["time"].iloc[0] == result["time"].iloc[1]
+
+    def test_non_timestamp_columns_unchanged(self):
+        """Test that labels and partially valid timestamp columns are left as strings."""
+        df = pd.DataFrame(
+            {
+                "label": ["A", "B", "C"],
+                "version": ["0.2.0", "0.1.8", "0.1.5"],
+                "mixed": ["2024-01-01", "2024-01-02", "2024-13-45"],
+            }
+        )
+
+        result = parse_datetime_columns(df)
+
+        assert all(result[col].dtype == object for col in df.columns)
+
+    def test_parses_categorical_timestamps(self):
+        """Test that categorical timestamps become a datetime64 column, not categories."""
+        df = pd.DataFrame({"date": pd.Categorical(["2024-01-02", "2024-01-01", "2024-01-02"])})
+
+        result = parse_datetime_columns(df)
+
+        assert pd.api.types.is_datetime64_dtype(result["date"])
+        assert (
+            result["date"].tolist()
+            == pd.to_datetime(["2024-01-02", "2024-01-01", "2024-01-02"]).tolist()
+        )
+
+
+class TestPrepareDataframe:
+    """Test the prepare_dataframe function."""
+
+    def test_datetime_parsing_only_for_line_plots(self):
+        """Test that timestamps are parsed for line plots but kept as labels for bar plots."""
+        df = read_csv("date,value\n2024-01-01,1\n2024-01-02,2")
+
+        assert pd.api.types.is_datetime64_dtype(prepare_dataframe(df, "line")["date"])
+        assert prepare_dataframe(df, "bar")["date"].dtype == object
+        # The parsed data itself is left untouched
+        assert df["date"].dtype == object
+
+
+class TestCompactDataframe:
+    """Test the compact_dataframe and read_csv functions."""
+
+    def test_compact_dataframe(self):
+        """Test that repeated strings become categories and numbers are downcast exactly."""
+        df = pd.DataFrame(
+            {
+                "label": ["b", "a", "b", "a", "c", "b"],
+                "id": ["1", "2", "3", "4", "5", "6"],
+                "count": [1, 2, 3, 4, 5, 300],
+                "exact": [0.5, 1.25, 2.0, 3.0, 4.0, 5.0],
+                "decimal": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
+                "flag": [True, False, True, False, True, False],
+            }
+        )
+
+        result = compact_dataframe(df.copy())
+
+        # Categories in order of appearance, the order plots use for strings
+        assert result["label"].cat.categories.tolist() == ["b", "a", "c"]
+        assert result["id"].dtype == object
+        assert result["count"].dtype == np.int16
+        assert result["exact"].dtype == np.float32
+        assert result["decimal"].dtype == np.float64
+        assert result["flag"].dtype == bool
+        pd.testing.assert_frame_equal(result.astype(df.dtypes.to_dict()), df)
+
+    def test_read_csv_parses_categories_in_order_of_appearance(self):
+        """Test that categories parsed by read_csv are ordered as they appear."""
+        csv_data = "label,value\n" + "\n".join(f"{label},1" for label in "zbzbaz" * 10)
+
+        df = read_csv(csv_data)
+
+        assert df["label"].cat.categories.tolist() == ["z", "b", "a"]
+        assert df["value"].dtype == np.int8
+
+    def test_compaction_bytes(self):
+        """Test that bytes before compaction match the memory of the default parse."""
+        df = pd.DataFrame({"label": ["first", "second"] * 500, "value": range(1_000)})
+        compacted = compact_dataframe(df.copy())
+
+        before, after = compaction_bytes(compacted)
+
+        assert before == df.memory_usage(deep=True, index=False).sum()
+        assert after == compacted.memory_usage(deep=True, index=False).sum()
+        assert after < before / 4
+
+    def test_prepare_dataframe_drops_unused_categories(self):
+        """Test that categories missing from downsampled data are dropped."""
+        df = compact_dataframe(pd.DataFrame({"label": ["a", "a", "b", "b", "a", "a"]}))
+
+        result = prepare_dataframe(df.iloc[::4], "bar")
+
+        assert result["label"].cat.categories.tolist() == ["a"]
+
+
+class TestDownsample:
+    """Test the downsample function."""
+
+    def test_downsample(self):
+        """Test that every n-th row is kept to stay within the row limit."""
+        df = pd.DataFrame({"x": range(10)})
+
+        assert downsample(df, 4)["x"].tolist() == [0, 3, 6, 9]
+        assert downsample(df, 10) is df
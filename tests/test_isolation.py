@@ -0,0 +1,115 @@
+"""Tests for rendering in a child process with resource limits."""
+
+import errno
+import functools
+import resource
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from mcp.types import ImageContent
+
+from plotting_mcp import server
+from plotting_mcp.isolation import RenderLimitError, RenderLimits, _out_of_memory, run_isolated
+
+
+class TestRunIsolated:
+    """Test the run_isolated function."""
+
+    def test_returns_result(self):
+        """Test that the result of the function is sent back."""
+        assert run_isolated(sorted, [3, 1, 2]) == [1, 2, 3]
+
+    def test_reraises_exception(self):
+        """Test that an exception of the function is raised again in the caller."""
+        with pytest.raises(ValueError, match="invalid literal"):
+            run_isolated(int, "not a number")
+
+    def test_memory_limit(self):
+        """Test that exceeding the address space limit raises an error naming it."""
+        limits = RenderLimits(memory_bytes=512 * 1024 * 1024)
+
+        with pytest.raises(RenderLimitError, match="memory limit of 512.0MiB") as error:
+            run_isolated(bytearray, 1024 * 1024 * 1024, limits=limits)
+        assert error.value.limit == "memory"
+
+    def test_cpu_limit(self):
+        """Test that exceeding the CPU time limit raises an error naming it."""
+        limits = RenderLimits(cpu_seconds=1)
+
+        with pytest.raises(RenderLimitError, match="CPU time limit of 1s") as error:
+            run_isolated(sum, range(10**12), limits=limits)
+        assert error.value.limit == "cpu"
+
+    def test_time_limit(self):
+        """Test that a child past the deadline is killed and raises an error naming it."""
+        limits = RenderLimits(timeout_seconds=0.2)
+
+        start = time.perf_counter()
+        with pytest.raises(RenderLimitError, match="time limit of 0.2s") as error:
+            run_isolated(time.sleep, 30, limits=limits)
+        assert error.value.limit == "time"
+        assert time.perf_counter() - start < 10
+
+
+class TestOutOfMemory:
+    """Test the _out_of_memory function."""
+
+    def test_failed_allocations(self):
+        """Test that allocation failures of imports and the parser count as memory breaches."""
+        assert _out_of_memory(MemoryError())
+        assert _out_of_memory(
+            pd.errors.ParserError("Error tokenizing data. C error: out of memory")
+        )
+        assert _out_of_memory(
+            ImportError("_backend_agg.so: failed to map segment from shared object")
+        )
+        assert _out_of_memory(OSError(errno.ENOMEM, "Cannot allocate memory"))
+
+    def test_other_errors(self):
+        """Test that other errors are passed on as they are."""
+        assert not _out_of_memory(ImportError("No module named 'missing'"))
+        assert not _out_of_memory(OSError(errno.ENOENT, "No such file or directory"))
+        assert not _out_of_memory(ValueError("out of memory"))
+
+
+class TestIsolatedGeneratePlot:
+    """Test generate_plot in isolation mode."""
+
+    @pytest.fixture(autouse=True)
+    def isolation(self, monkeypatch):
+        monkeypatch.setattr(server, "PLOT_ISOLATION", True)
+
+    def test_preview_and_follow_up(self):
+        """Test that a preview's data is kept by the server for a full-quality follow-up."""
+        csv_data = "x,y\n" + "\n".join(f"{i},{i * 2}" for i in range(100))
+
+        text, image = server.generate_plot(
+            csv_data, "line", json_kwargs='{"x": "x", "y": "y"}', quality="preview"
+        )
+        handle = text.text.split("Preview handle: ")[1].split(".")[0]
+        text, image = server.generate_plot(
+            plot_type="line", json_kwargs='{"x": "x", "y": "y"}', handle=handle
+        )
+
+        assert text.text.startswith("Plot generated successfully")
+        assert isinstance(image, ImageContent)
+
+    def test_limit_breach_is_tool_error(self, monkeypatch):
+        """Test that a render over its memory limit fails the call, not the server."""
+        # A limit leaving the child 16MiB, which encoding the 25MB of CSV text exceeds
+        pages = int(run_isolated(Path("/proc/self/statm").read_text).split()[0])
+        limits = RenderLimits(memory_bytes=pages * resource.getpagesize() + 16 * 1024 * 1024)
+        monkeypatch.setattr(server, "run_isolated", functools.partial(run_isolated, limits=limits))
+        csv_data = "x,y\n" + "\n".join(f"{i},{i * 2}" for i in range(2_000_000))
+
+        with pytest.raises(RenderLimitError, match="memory limit") as error:
+            server.generate_plot(csv_data, "line", json_kwargs='{"x": "x", "y": "y"}')
+        assert error.value.limit == "memory"
+        csv_data = "x,y\n" + "\n".join(f"{i},{i * 2}" for i in range(1_000))
+
+        # The server still renders the next request
+        monkeypatch.setattr(server, "run_isolated", run_isolated)
+        _, image = server.generate_plot(csv_data, "line", json_kwargs='{"x": "x", "y": "y"}')
+        assert isinstance(image, ImageContent)
@@ -0,0 +1,32 @@
+"""Tests for seeding the matplotlib cache."""
+
+from plotting_mcp.mpl_cache import seed_matplotlib_cache
+
+
+class TestSeedMatplotlibCache:
+    """Test the seed_matplotlib_cache function."""
+
+    def test_copies_missing_files(self, tmp_path, monkeypatch):
+        """Test that baked files are copied without overwriting existing ones."""
+        seed_dir, config_dir = tmp_path / "seed", tmp_path / "config"
+        seed_dir.mkdir()
+        (seed_dir / "fontlist-v390.json").write_text("baked")
+        (seed_dir / "other.json").write_text("baked")
+        config_dir.mkdir()
+        (config_dir / "other.json").write_text("existing")
+        monkeypatch.setenv("MPLCONFIGDIR", str(config_dir))
+
+        copied = seed_matplotlib_cache(str(seed_dir))
+
+        assert copied == ["fontlist-v390.json"]
+        assert (config_dir / "fontlist-v390.json").read_text() == "baked"
+        assert (config_dir / "other.json").read_text() == "existing"
+
+    def test_without_seed_or_config_dir(self, tmp_path, monkeypatch):
+        """Test that nothing is copied when either directory is not configured."""
+        monkeypatch.delenv("MPLCONFIGDIR", raising=False)
+        assert seed_matplotlib_cache(str(tmp_path)) == []
+
+        monkeypatch.setenv("MPLCONFIGDIR", str(tmp_path / "config"))
+        assert seed_matplotlib_cache("") == []
+        assert seed_matplotlib_cache(str(tmp_path / "missing")) == []
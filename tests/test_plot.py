@@ -1,14 +1,27 @@
 """Tests for plotting functionality."""
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import pytest
+import seaborn as sns
+import shapely
+from cartopy.io import shapereader
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
 
+from plotting_mcp import plot
 from plotting_mcp.plot import (
+    GLOBAL_EXTENT,
+    _aggregate_bar_data,
     _auto_rotate_labels,
+    _clip_feature_geometries,
+    _compute_map_extent,
+    _create_fast_line_plot,
     _create_pie_plot,
     _create_plot,
+    _load_feature_index,
+    _select_feature_scale,
     plot_to_bytes,
 )
 
@@ -131,6 +144,179 @@ class TestCreatePiePlot:
         plt.close(fig)
 
 
+class TestCreateFastLinePlot:
+    """Test the _create_fast_line_plot function."""
+
+    def test_hue_groups_drawn_as_one_collection(self):
+        """Test that hue groups are drawn as a single LineCollection with a legend."""
+        df = pd.DataFrame(
+            {
+                "x": [3, 1, 2, 1, 2, 3],
+                "y": [30, 10, 20, 15, 25, 35],
+                "category": ["A", "A", "A", "B", "B", "B"],
+            }
+        )
+        fig, ax = plt.subplots()
+
+        assert _create_fast_line_plot(ax, df, x="x", y="y", hue="category")
+
+        (lines,) = [c for c in ax.collections if isinstance(c, LineCollection)]
+        segments = lines.get_segments()
+        assert len(segments) == 2
+        # Each group is sorted by x
+        assert segments[0].tolist() == [[1, 10], [2, 20], [3, 30]]
+        assert ax.get_xlabel() == "x"
+        assert ax.get_ylabel() == "y"
+        legend = ax.get_legend()
+        assert legend.get_title().get_text() == "category"
+        assert [text.get_text() for text in legend.get_texts()] == ["A", "B"]
+        # One hidden line through both groups guides the legend placement
+        (outline,) = ax.lines
+        assert not outline.get_visible()
+        assert np.isnan(outline.get_xdata()).sum() == 1
+        plt.close(fig)
+
+    def test_falls_back_when_aggregation_needed(self):
+        """Test that repeated x values within a group are left to seaborn."""
+        df = pd.DataFrame({"x": [1, 1, 2], "y": [1, 2, 3], "category": ["A", "A", "A"]})
+        fig, ax = plt.subplots()
+
+        assert not _create_fast_line_plot(ax, df, x="x", y="y", hue="category")
+        assert not ax.collections
+        plt.close(fig)
+
+    def test_falls_back_for_numeric_hue_and_unknown_kwargs(self):
+        """Test that numeric hues and unsupported kwargs are left to seaborn."""
+        df = pd.DataFrame({"x": [1, 2, 3], "y": [1, 2, 3], "size": [1, 1, 2]})
+        fig, ax = plt.subplots()
+
+        assert not _create_fast_line_plot(ax, df, x="x", y="y", hue="size")
+        assert not _create_fast_line_plot(ax, df, x="x", y="y", hue="size", marker="o")
+        assert not _create_fast_line_plot(ax, df, x="x", y="y")
+        plt.close(fig)
+
+
+class TestAggregateBarData:
+    """Test the _aggregate_bar_data function."""
+
+    def _bars(self, df: pd.DataFrame, **kwargs) -> list[tuple[float, float]]:
+        fig, ax = plt.subplots()
+        sns.barplot(data=df, ax=ax, **kwargs)
+        bars = [(bar.get_x(), bar.get_height()) for bar in ax.patches if bar.get_width()]
+        plt.close(fig)
+        return bars
+
+    def test_one_row_per_bar_draws_same_bars(self):
+        """Test that bars of aggregated data match those of the full data."""
+        df = pd.DataFrame(
+            {
+                "x": pd.Categorical(["b", "a", "b", "a", "c", "b"], categories=["b", "a", "c"]),
+                "y": [1, 2, 3, 4, 5, 6],
+                "group": ["G", "H", "H", "G", "G", "G"],
+            }
+        )
+        for estimator in ["mean", "sum", "max"]:
+            kwargs = {"x": "x", "y": "y", "hue": "group", "errorbar": None, "estimator": estimator}
+
+            aggregated = _aggregate_bar_data(df, **kwargs)
+
+            assert len(aggregated) == 5
+            assert aggregated["x"].dtype == df["x"].dtype
+            assert self._bars(aggregated, **kwargs) == self._bars(df, **kwargs)
+
+    def test_keeps_rows_when_needed(self):
+        """Test that error bars and other estimators get every row."""
+        df = pd.DataFrame({"x": ["a", "a", "b"], "y": [1, 2, 3]})
+
+        assert _aggregate_bar_data(df, x="x", y="y") is df
+        assert _aggregate_bar_data(df, x="x", y="y", errorbar=None, estimator="count") is df
+        assert _aggregate_bar_data(df, x="x", y="y", errorbar=None, orient="h") is df
+        assert len(_aggregate_bar_data(df, x="x", y="y", errorbar=None)) == 2
+
+
+class TestMapExtent:
+    """Test the map extent and feature scale helpers."""
+
+    def test_compute_map_extent_city(self):
+        """Test that a cluster of nearby points gets a small padded extent."""
+        lons = pd.Series([18.467, 18.468, 18.470])
+        lats = pd.Series([-33.941, -33.942, -33.944])
+
+        lon_min, lon_max, lat_min, lat_max = _compute_map_extent(lons, lats)
+
+        assert lon_min == pytest.approx(17.967)
+        assert lon_max == pytest.approx(18.970)
+        assert lat_min == pytest.approx(-34.444)
+        assert lat_max == pytest.approx(-33.441)
+
+    def test_compute_map_extent_clamps_to_globe(self):
+        """Test that padding never goes beyond valid coordinates."""
+        extent = _compute_map_extent(pd.Series([170.0, 179.9]), pd.Series([80.0, 89.9]))
+
+        assert extent[1] == 180.0
+        assert extent[3] == 90.0
+
+    def test_compute_map_extent_global(self):
+        """Test that points spread over the globe get the global extent."""
+        extent = _compute_map_extent(pd.Series([-150.0, 150.0]), pd.Series([-60.0, 60.0]))
+
+        assert extent == GLOBAL_EXTENT
+
+    def test_select_feature_scale(self):
+        """Test that smaller extents use more detailed features."""
+        assert _select_feature_scale(GLOBAL_EXTENT) == "110m"
+        assert _select_feature_scale((0.0, 40.0, 0.0, 20.0)) == "50m"
+        assert _select_feature_scale((17.9, 19.0, -34.5, -33.4)) == "10m"
+
+    def test_clip_feature_geometries(self, monkeypatch):
+        """Test that only geometries intersecting the extent are kept, clipped to it."""
+        geometries = [shapely.box(10, -40, 30, -20), shapely.box(100, 0, 120, 10)]
+        monkeypatch.setattr(plot, "_load_feature_index", lambda *args: shapely.STRtree(geometries))
+
+        clipped = _clip_feature_geometries("physical", "land", "10m", (15.0, 20.0, -35.0, -30.0))
+
+        assert len(clipped) == 1
+        assert clipped[0].bounds == (15.0, -35.0, 20.0, -30.0)
+
+    def test_feature_index_splits_multipolygons(self, natural_earth):
+        """Test that the index holds each polygon of a multipolygon record separately."""
+        records = list(shapereader.Reader(natural_earth / "ne_10m_land.shp").geometries())
+        index = _load_feature_index("physical", "land", "10m")
+
+        assert len(records) == 1
+        assert len(index.geometries) == len(records[0].geoms)
+        assert set(shapely.get_type_id(index.geometries)) == {shapely.GeometryType.POLYGON}
+
+        region = shapely.box(15.0, -35.0, 20.0, -30.0)
+        assert len(index.query(region)) == 1
+
+    def test_feature_indices_keep_coarse_and_last_detailed_scale(self, natural_earth, monkeypatch):
+        """Test that 110m stays loaded while a detailed scale replaces the previous one."""
+        loaded = []
+        load = shapereader.natural_earth
+        monkeypatch.setattr(
+            shapereader,
+            "natural_earth",
+            lambda **kwargs: loaded.append(kwargs["resolution"]) or load(**kwargs),
+        )
+
+        for scale in ["110m", "50m", "110m", "50m", "10m", "110m", "50m"]:
+            _load_feature_index("physical", "land", scale)
+
+        assert loaded == ["110m", "50m", "10m", "50m"]
+
+    def test_feature_index_memory_estimate(self, natural_earth):
+        """Test that the cache reports the memory of the indices it holds."""
+        assert plot.feature_indices.nbytes == 0
+
+        index = _load_feature_index("physical", "coastline", "10m")
+
+        coordinates = shapely.get_num_coordinates(index.geometries).sum()
+        assert plot.feature_indices.nbytes == coordinates * plot.FEATURE_INDEX_BYTES_PER_COORDINATE
+        _load_feature_index("physical", "coastline", "50m")
+        assert plot.feature_indices.nbytes < coordinates * plot.FEATURE_INDEX_BYTES_PER_COORDINATE
+
+
 class TestCreateMatplotlibPlot:
     """Test the _create_matplotlib_plot function."""
 
@@ -164,6 +350,61 @@ class TestCreateMatplotlibPlot:
         assert len(ax.patches) > 0  # Pie plot should have wedges (patches)
         plt.close(fig)
 
+    def test_create_histogram_plot(self):
+        """Test that a histogram is drawn as a single outline over all bins."""
+        df = pd.DataFrame({"label": ["a"] * 1_000, "value": range(1_000)})
+
+        fig, ax = _create_plot(df, "histogram", bins=10)
+
+        assert len(ax.patches) == 1
+        assert ax.get_xlabel() == "value"
+        assert ax.get_ylabel() == "Count"
+        plt.close(fig)
+
+    def test_create_heatmap_plot(self):
+        """Test that a heatmap draws one mesh with the requested number of cells."""
+        df = pd.DataFrame({"x": range(100), "y": [i % 7 for i in range(100)]})
+
+        fig, ax = _create_plot(df, "heatmap", bins=[5, 7])
+
+        (mesh,) = ax.collections
+        assert mesh.get_array().sum() == 100
+        assert mesh.get_array().shape == (7, 5)
+        plt.close(fig)
+
+    def test_heatmap_bins(self):
+        """Test that any number is used for both axes and other shapes are rejected."""
+        df = pd.DataFrame({"x": range(100), "y": [i % 7 for i in range(100)]})
+
+        fig, ax = _create_plot(df, "heatmap", bins=10.0)
+        (mesh,) = ax.collections
+        assert mesh.get_array().shape == (10, 10)
+        plt.close(fig)
+
+        for bins in ["10", [1, 2, 3], {"x": 10}]:
+            with pytest.raises(ValueError, match="bins"):
+                _create_plot(df, "heatmap", bins=bins)
+        plt.close("all")
+
+    def test_create_box_plot(self):
+        """Test that one box is drawn per group."""
+        df = pd.DataFrame({"group": ["a", "b", "c"] * 10, "value": range(30)})
+
+        fig, ax = _create_plot(df, "box", x="group", y="value")
+
+        assert len(ax.patches) == 3
+        assert [label.get_text() for label in ax.get_xticklabels()] == ["a", "b", "c"]
+        plt.close(fig)
+
+    def test_aggregating_plot_requires_numeric_column(self):
+        """Test that aggregating plots reject non-numeric data."""
+        df = pd.DataFrame({"label": ["a", "b", "c"]})
+
+        with pytest.raises(ValueError, match="requires 1 numeric column"):
+            _create_plot(df, "histogram")
+        with pytest.raises(ValueError, match="must be numeric"):
+            _create_plot(df, "box", y="label")
+
     def test_empty_dataframe_raises_error(self):
         """Test that empty DataFrame raises ValueError."""
         df = pd.DataFrame()
@@ -0,0 +1,39 @@
+"""Tests for the warm-up of the render fork server."""
+
+from cartopy.io import shapereader
+
+from plotting_mcp import plot, preload, warmup
+
+
+class TestWarmForkServer:
+    """Test the warm_fork_server function."""
+
+    def test_renders_plots_and_loads_map_features(self, natural_earth, monkeypatch):
+        """Test that every warm-up plot is rendered and the kept map feature indices loaded."""
+        rendered = []
+
+        def plot_to_bytes(df, plot_type, **kwargs):
+            rendered.append(plot_type)
+            return plot.plot_to_bytes(df, plot_type, **kwargs)
+
+        monkeypatch.setattr(preload, "plot_to_bytes", plot_to_bytes)
+
+        preload.warm_fork_server()
+
+        assert rendered == [plot_type for plot_type, _, _ in warmup.WARMUP_PLOTS]
+        # Nothing is read again for the kept scales
+        monkeypatch.setattr(shapereader, "natural_earth", None)
+        for scale in ["110m", "10m"]:
+            for category, name, _ in plot.MAP_FEATURES:
+                plot._load_feature_index(category, name, scale)
+
+    def test_failures_are_skipped(self, monkeypatch):
+        """Test that failed steps raise nothing, so the fork server still starts."""
+
+        def fail():
+            raise OSError("Natural Earth data unavailable")
+
+        monkeypatch.setattr(preload, "WARMUP_PLOTS", [("unknown", warmup._bar_data, {})])
+        monkeypatch.setattr(preload, "load_map_features", fail)
+
+        preload.warm_fork_server()
@@ -0,0 +1,108 @@
+"""Tests for the readiness check."""
+
+import json
+import threading
+import time
+
+from plotting_mcp import readiness
+from plotting_mcp.readiness import _cgroup_memory, check_readiness, memory_headroom
+from plotting_mcp.scheduler import RenderScheduler
+from plotting_mcp.server import readiness_check
+
+MiB = 1024 * 1024
+
+
+class TestMemoryHeadroom:
+    """Test reading the memory limit and usage of the container."""
+
+    def test_cgroup_v2(self, tmp_path):
+        """Test that inactive page cache is not counted as used memory."""
+        (tmp_path / "memory.max").write_text(f"{128 * MiB}\n")
+        (tmp_path / "memory.current").write_text(f"{100 * MiB}\n")
+        (tmp_path / "memory.stat").write_text(f"anon 1\ninactive_file {20 * MiB}\n")
+
+        assert _cgroup_memory(tmp_path) == (128 * MiB, 80 * MiB)
+        assert memory_headroom(tmp_path) == 48 * MiB
+
+    def test_cgroup_v1_without_limit(self, tmp_path, monkeypatch):
+        """Test that an unlimited cgroup has no headroom unless a limit is configured."""
+        (tmp_path / "memory").mkdir()
+        (tmp_path / "memory" / "memory.limit_in_bytes").write_text("9223372036854771712\n")
+        (tmp_path / "memory" / "memory.usage_in_bytes").write_text(f"{10 * MiB}\n")
+
+        assert _cgroup_memory(tmp_path) == (None, 10 * MiB)
+        assert memory_headroom(tmp_path) is None
+
+        monkeypatch.setattr(readiness, "PLOT_MEMORY_LIMIT_MB", 64)
+        assert memory_headroom(tmp_path) == 54 * MiB
+
+    def test_without_cgroup(self, tmp_path, monkeypatch):
+        """Test that the process memory is used outside a container."""
+        monkeypatch.setattr(readiness, "PLOT_MEMORY_LIMIT_MB", 64 * 1024)
+
+        headroom = memory_headroom(tmp_path)
+
+        assert headroom is not None and 0 < headroom < 64 * 1024 * MiB
+
+
+class TestCheckReadiness:
+    """Test the check_readiness function."""
+
+    def test_ready_when_idle(self):
+        """Test that an idle server with enough memory is ready."""
+        report = check_readiness(RenderScheduler(), headroom_bytes=64 * MiB)
+
+        assert report.ready
+        assert report.as_dict() == {
+            "status": "ready",
+            "in_flight": 0,
+            "queue_depth": 0,
+            "longest_render_seconds": 0.0,
+            "p95_latency_seconds": None,
+            "memory_headroom_bytes": 64 * MiB,
+            "reasons": [],
+        }
+
+    def test_saturated_above_thresholds(self, monkeypatch):
+        """Test that every exceeded threshold is reported as a reason."""
+        monkeypatch.setattr(readiness, "PLOT_READY_MAX_RENDER_SECONDS", 0.0)
+        monkeypatch.setattr(readiness, "PLOT_READY_MAX_P95_SECONDS", 0.0)
+        scheduler = RenderScheduler()
+        with scheduler.slot("fast"):
+            pass
+
+        with scheduler.slot("slow"):
+            time.sleep(0.01)
+            report = check_readiness(scheduler, headroom_bytes=1 * MiB)
+
+        assert not report.ready
+        assert report.as_dict()["status"] == "saturated"
+        assert report.in_flight == 1
+        assert len(report.reasons) == 3
+        assert "a render has been running" in report.reasons[0]
+        assert "p95 latency" in report.reasons[1]
+        assert "1.0MiB memory headroom (min 16.0MiB)" in report.reasons[2]
+
+
+class TestReadinessCheck:
+    """Test the /ready route."""
+
+    def test_readiness_route(self, monkeypatch):
+        """Test that the route is unready while warming up and reports the statistics."""
+        warmed_up = threading.Event()
+        monkeypatch.setattr("plotting_mcp.server.ready", warmed_up)
+        monkeypatch.setattr(readiness, "memory_headroom", lambda: None)
+
+        response = readiness_check(None)
+        assert response.status_code == 503
+        assert json.loads(response.body) == {"status": "warming up"}
+
+        warmed_up.set()
+        response = readiness_check(None)
+        assert response.status_code == 200
+        assert json.loads(response.body)["status"] == "ready"
+
+        monkeypatch.setattr(readiness, "PLOT_READY_MAX_QUEUE_DEPTH", -1)
+        response = readiness_check(None)
+        assert response.status_code == 503
+        assert json.loads(response.body)["reasons"] == ["0 requests waiting (max -1)"]
@@ -0,0 +1,201 @@
+"""Tests for request cost estimation, admission control and scheduling."""
+
+import threading
+import time
+
+from plotting_mcp.scheduler import (
+    RenderScheduler,
+    admit,
+    count_csv_rows,
+    estimate_cost,
+    is_downsamplable,
+)
+
+MiB = 1024 * 1024
+
+
+class TestCountCsvRows:
+    """Test the count_csv_rows function."""
+
+    def test_count_csv_rows(self):
+        """Test that the header is not counted, with or without a trailing newline."""
+        assert count_csv_rows("x,y\n1,2\n3,4") == 2
+        assert count_csv_rows("x,y\n1,2\n3,4\n") == 2
+        assert count_csv_rows("x,y") == 0
+        assert count_csv_rows("") == 0
+
+
+class TestEstimateCost:
+    """Test the estimate_cost function."""
+
+    def test_cost_grows_with_rows(self):
+        """Test that more rows cost more memory and CPU."""
+        small = estimate_cost("line", rows=10, payload_bytes=100)
+        large = estimate_cost("line", rows=100_000, payload_bytes=1_000_000)
+
+        assert large.memory_bytes > small.memory_bytes
+        assert large.cpu_units > small.cpu_units
+
+    def test_aggregating_plots_render_bins_not_rows(self):
+        """Test that histograms only pay per row for parsing and binning."""
+        histogram = estimate_cost("histogram", rows=1_000_000, payload_bytes=10_000_000)
+        line = estimate_cost("line", rows=1_000_000, payload_bytes=10_000_000)
+
+        assert histogram.render_bytes == 0
+        assert histogram.cpu_units < line.cpu_units / 10
+
+    def test_lanes(self):
+        """Test that small plots go to the fast lane and large ones to the slow lane."""
+        assert estimate_cost("pie", rows=5, payload_bytes=50).lane == "fast"
+        assert estimate_cost("line", rows=2_000_000, payload_bytes=20 * MiB).lane == "slow"
+
+    def test_unknown_plot_type(self):
+        """Test that unknown plot types are estimated instead of raising."""
+        cost = estimate_cost("scatter3d", rows=10, payload_bytes=100)
+
+        assert cost.memory_bytes > 0
+
+
+class TestAdmit:
+    """Test the admit function."""
+
+    def test_accept_within_budget(self):
+        """Test that requests within the budget are accepted unchanged."""
+        cost = estimate_cost("bar", rows=100, payload_bytes=1_000)
+        decision = admit(cost, budget_bytes=64 * MiB)
+
+        assert decision.action == "accept"
+        assert decision.skiprows is None
+        assert "accepted" in decision.describe()
+
+    def test_downgrade_over_budget(self):
+        """Test that downsamplable requests over budget are downgraded to fit."""
+        cost = estimate_cost("line", rows=2_000_000, payload_bytes=40 * MiB)
+        decision = admit(cost, budget_bytes=64 * MiB)
+
+        assert decision.action == "downgrade"
+        assert decision.sample_step > 1
+        assert decision.effective_cost.memory_bytes <= 64 * MiB
+        assert "downgraded" in decision.describe()
+
+        # Header and every n-th data row are kept
+        skiprows = decision.skiprows
+        assert skiprows is not None
+        assert not skiprows(0)
+        assert skiprows(1)
+        assert not skiprows(decision.sample_step)
+
+    def test_reject_bar_totals_over_budget(self):
+        """Test that bar plots of sums or counts are rejected, a subsample changes them."""
+        cost = estimate_cost("bar", rows=2_000_000, payload_bytes=40 * MiB)
+
+        for estimator in ["sum", "count"]:
+            decision = admit(cost, budget_bytes=64 * MiB, kwargs={"estimator": estimator})
+            assert decision.action == "reject"
+        for kwargs in [{}, {"estimator": "median"}]:
+            decision = admit(cost, budget_bytes=64 * MiB, kwargs=kwargs)
+            assert decision.action == "downgrade"
+
+    def test_reject_pie_over_budget(self):
+        """Test that pie charts over budget are rejected rather than downsampled."""
+        cost = estimate_cost("pie", rows=200_000, payload_bytes=4 * MiB)
+        decision = admit(cost, budget_bytes=64 * MiB)
+
+        assert decision.action == "reject"
+        assert "rejected" in decision.describe()
+
+
+class TestIsDownsamplable:
+    """Test the is_downsamplable function."""
+
+    def test_is_downsamplable(self):
+        """Test that only plots of means, medians or single rows can be downsampled."""
+        assert is_downsamplable("line")
+        assert is_downsamplable("line", {"estimator": None})
+        assert is_downsamplable("bar", {"estimator": "mean"})
+        assert is_downsamplable("worldmap", {"estimator": "sum"})
+        assert not is_downsamplable("bar", {"estimator": "sum"})
+        assert not is_downsamplable("line", {"estimator": "count"})
+        assert not is_downsamplable("pie")
+        assert not is_downsamplable("histogram")
+
+
+class TestRenderScheduler:
+    """Test the RenderScheduler class."""
+
+    def test_fast_lane_starts_first(self):
+        """Test that waiting fast lane requests start before waiting slow lane requests."""
+        scheduler = RenderScheduler(max_concurrent=1)
+        started = []
+
+        def run(name, lane):
+            with scheduler.slot(lane):
+                started.append(name)
+
+        with scheduler.slot("slow"):
+            slow = threading.Thread(target=run, args=("slow", "slow"))
+            slow.start()
+            while scheduler.queue_depth < 1:
+                time.sleep(0.01)
+            fast = threading.Thread(target=run, args=("fast", "fast"))
+            fast.start()
+            while scheduler.queue_depth < 2:
+                time.sleep(0.01)
+            assert scheduler.in_flight == 1
+
+        slow.join()
+        fast.join()
+
+        assert started == ["fast", "slow"]
+        assert scheduler.in_flight == 0
+        assert scheduler.queue_depth == 0
+
+    def test_overdue_slow_lane_starts_first(self):
+        """Test that a slow lane request waiting too long starts before the fast lane."""
+        scheduler = RenderScheduler(max_concurrent=1, slow_lane_max_wait=0.05)
+        started = []
+
+        def run(name, lane):
+            with scheduler.slot(lane):
+                started.append(name)
+
+        with scheduler.slot("fast"):
+            slow = threading.Thread(target=run, args=("slow", "slow"))
+            slow.start()
+            while scheduler.queue_depth < 1:
+                time.sleep(0.01)
+            time.sleep(0.1)
+            fast = threading.Thread(target=run, args=("fast", "fast"))
+            fast.start()
+            while scheduler.queue_depth < 2:
+                time.sleep(0.01)
+
+        slow.join()
+        fast.join()
+
+        assert started == ["slow", "fast"]
+        assert scheduler.queue_depth == 0
+
+    def test_latency_statistics(self):
+        """Test that running renders and recent latencies are tracked."""
+        scheduler = RenderScheduler(max_concurrent=1, latency_window=60.0)
+        assert scheduler.latency_percentile(95) is None
+
+        with scheduler.slot("fast"):
+            time.sleep(0.05)
+            assert scheduler.longest_render_seconds >= 0.05
+        with scheduler.slot("fast"):
+            pass
+
+        assert scheduler.longest_render_seconds == 0.0
+        assert scheduler.latency_percentile(95) >= 0.05
+        assert scheduler.latency_percentile(50) < 0.05
+
+    def test_latencies_expire(self):
+        """Test that latencies older than the window no longer count."""
+        scheduler = RenderScheduler(max_concurrent=1, latency_window=0.05)
+        with scheduler.slot("fast"):
+            pass
+        time.sleep(0.06)
+
+        assert scheduler.latency_percentile(95) is None
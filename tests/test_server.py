@@ -2,12 +2,18 @@
 
 import base64
 import json
+import re
 
+import numpy as np
+import pandas as pd
 import pytest
 from mcp.types import ImageContent, TextContent
 from pandas.errors import EmptyDataError
 
+from plotting_mcp import plot, server
+from plotting_mcp.cache import DataFrameCache
 from plotting_mcp.server import generate_plot
+from plotting_mcp.utils import sizeof_fmt
 
 
 class TestGeneratePlot:
@@ -27,7 +33,7 @@ class TestGeneratePlot:
         assert isinstance(image_content, ImageContent)
 
         assert text_content.type == "text"
-        assert text_content.text == "Plot generated successfully"
+        assert text_content.text.startswith("Plot generated successfully")
 
         assert image_content.type == "image"
         assert image_content.mimeType == "image/png"
@@ -44,7 +50,7 @@ class TestGeneratePlot:
         result = generate_plot(csv_data, "bar", json_kwargs='{"x": "category", "y": "values"}')
 
         text_content, image_content = result
-        assert text_content.text == "Plot generated successfully"
+        assert text_content.text.startswith("Plot generated successfully")
         assert image_content.mimeType == "image/png"
 
         # Verify the image data is valid
@@ -58,7 +64,7 @@ class TestGeneratePlot:
         result = generate_plot(csv_data, "pie")
 
         text_content, image_content = result
-        assert text_content.text == "Plot generated successfully"
+        assert text_content.text.startswith("Plot generated successfully")
         assert image_content.mimeType == "image/png"
 
         # Verify the image data is valid
@@ -73,7 +79,7 @@ class TestGeneratePlot:
         result = generate_plot(csv_data)
 
         text_content, image_content = result
-        assert text_content.text == "Plot generated successfully"
+        assert text_content.text.startswith("Plot generated successfully")
         assert image_content.mimeType == "image/png"
 
     def test_generate_plot_with_title_and_labels(self):
@@ -84,7 +90,7 @@ class TestGeneratePlot:
         result = generate_plot(csv_data, "line", json.dumps(kwargs))
 
         text_content, image_content = result
-        assert text_content.text == "Plot generated successfully"
+        assert text_content.text.startswith("Plot generated successfully")
         assert image_content.mimeType == "image/png"
 
     def test_generate_plot_invalid_json_kwargs(self):
@@ -123,7 +129,7 @@ class TestGeneratePlot:
         result = generate_plot(csv_data, "worldmap")
 
         text_content, image_content = result
-        assert text_content.text == "Plot generated successfully"
+        assert text_content.text.startswith("Plot generated successfully")
         assert image_content.mimeType == "image/png"
 
         # Verify the image data is valid
@@ -138,7 +144,7 @@ class TestGeneratePlot:
         result = generate_plot(csv_data, "line", json.dumps(kwargs))
 
         text_content, image_content = result
-        assert text_content.text == "Plot generated successfully"
+        assert text_content.text.startswith("Plot generated successfully")
         assert image_content.mimeType == "image/png"
 
     def test_generate_plot_rejects_nan_values(self):
@@ -154,3 +160,74 @@ class TestGeneratePlot:
 
         with pytest.raises(ValueError, match="CSV data contains NaN/null values"):
             generate_plot(csv_data_with_empty, "line", '{"x": "x", "y": "y"}')
+
+    def test_generate_plot_reports_admission(self):
+        """Test that the admission decision is included in the response text."""
+        csv_data = "x,y\n1,2\n2,4\n3,6"
+
+        text_content, _ = generate_plot(csv_data, "line", '{"x": "x", "y": "y"}')
+
+        assert "Admission: accepted (fast lane" in text_content.text
+
+    def test_generate_plot_preview_then_full_from_handle(self):
+        """Test that a preview returns a handle that renders the full plot without CSV."""
+        csv_data = "x,y\n" + "\n".join(f"{i},{i * 2}" for i in range(5000))
+        kwargs = '{"x": "x", "y": "y"}'
+
+        preview_text, preview_image = generate_plot(csv_data, "line", kwargs, quality="preview")
+
+        assert preview_text.text.startswith("Preview generated successfully")
+        match = re.search(r"Preview handle: (\w+)\.", preview_text.text)
+        assert match is not None
+
+        full_text, full_image = generate_plot(
+            "", "line", kwargs, quality="full", handle=match.group(1)
+        )
+
+        assert full_text.text.startswith("Plot generated successfully")
+        # The preview is rendered at a lower resolution
+        assert len(base64.b64decode(preview_image.data)) < len(base64.b64decode(full_image.data))
+
+    def test_generate_plot_downgraded_preview_has_no_handle(self, monkeypatch):
+        """Test that a downsampled preview keeps no handle, a full render would be partial."""
+        monkeypatch.setattr(server, "PLOT_MEMORY_BUDGET_MB", 6)
+        csv_data = "x,y\n" + "\n".join(f"{i},{i * 2}" for i in range(60_000))
+
+        text, _ = generate_plot(csv_data, "line", '{"x": "x", "y": "y"}', quality="preview")
+
+        assert "downgraded to one in every" in text.text
+        assert "Preview handle" not in text.text
+        assert "downsampled to fit the memory budget" in text.text
+
+    def test_generate_plot_cached_data_counts_against_budget(self, monkeypatch):
+        """Test that data kept for follow-ups is taken out of the memory budget."""
+        monkeypatch.setattr(server, "PLOT_MEMORY_BUDGET_MB", 8)
+        monkeypatch.setattr(server, "data_cache", DataFrameCache())
+        # 2 MiB of float64 values
+        server.data_cache.put(pd.DataFrame({"x": np.zeros(256 * 1024)}))
+
+        text, _ = generate_plot("x,y\n1,2\n2,4", "line", '{"x": "x", "y": "y"}')
+
+        assert "of 6.0MiB budget" in text.text
+
+    def test_generate_plot_map_features_count_against_budget(self, natural_earth, monkeypatch):
+        """Test that loaded map feature indices are taken out of the memory budget."""
+        monkeypatch.setattr(server, "PLOT_MEMORY_BUDGET_MB", 8)
+        monkeypatch.setattr(server, "data_cache", DataFrameCache())
+        plot._load_feature_index("physical", "land", "10m")
+        budget = 8 * 1024 * 1024 - plot.feature_indices.nbytes
+
+        text, _ = generate_plot("x,y\n1,2\n2,4", "line", '{"x": "x", "y": "y"}')
+
+        assert plot.feature_indices.nbytes > 0
+        assert f"of {sizeof_fmt(budget)} budget" in text.text
+
+    def test_generate_plot_unknown_handle(self):
+        """Test that an unknown handle raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown or expired plot handle"):
+            generate_plot("", "line", handle="does-not-exist")
+
+    def test_generate_plot_invalid_quality(self):
+        """Test that an unsupported quality raises ValueError."""
+        with pytest.raises(ValueError, match="Unsupported quality"):
+            generate_plot("x,y\n1,2", "line", quality="draft")
@@ -0,0 +1,74 @@
+"""Tests for the warm-up at server start."""
+
+import json
+import threading
+
+from plotting_mcp import plot, readiness, warmup
+from plotting_mcp.scheduler import RenderScheduler
+from plotting_mcp.server import health_check, readiness_check
+
+
+class TestWarmUp:
+    """Test the warm_up function and readiness of the server."""
+
+    def test_ready_after_warm_up(self, monkeypatch):
+        """Test that /ready returns 503 until the warm-up has finished while / stays ok."""
+        # World maps need the Natural Earth data, which is baked into the image only
+        plots = [plot for plot in warmup.WARMUP_PLOTS if plot[0] != "worldmap"]
+        monkeypatch.setattr(warmup, "WARMUP_PLOTS", plots)
+        monkeypatch.setattr(warmup, "ready", threading.Event())
+        monkeypatch.setattr("plotting_mcp.server.ready", warmup.ready)
+        monkeypatch.setattr(readiness, "memory_headroom", lambda: None)
+
+        response = readiness_check(None)
+        assert response.status_code == 503
+        assert json.loads(response.body) == {"status": "warming up"}
+        assert health_check(None).status_code == 200
+
+        scheduler = RenderScheduler()
+        warmup.warm_up(scheduler)
+
+        response = readiness_check(None)
+        assert response.status_code == 200
+        assert json.loads(response.body)["status"] == "ready"
+        assert scheduler.in_flight == 0
+
+    def test_warms_up_native_line_renderer(self, monkeypatch):
+        """Test that a line warm-up plot takes the native renderer rather than seaborn."""
+        drawn = []
+        create = plot._create_fast_line_plot
+
+        def fast_line_plot(*args, **kwargs):
+            drawn.append(create(*args, **kwargs))
+            return drawn[-1]
+
+        monkeypatch.setattr(plot, "_create_fast_line_plot", fast_line_plot)
+        plots = [entry for entry in warmup.WARMUP_PLOTS if entry[0] == "line"]
+        monkeypatch.setattr(warmup, "WARMUP_PLOTS", plots)
+        monkeypatch.setattr(warmup, "ready", threading.Event())
+
+        warmup.warm_up(RenderScheduler())
+
+        assert True in drawn
+
+    def test_isolation_mode_only_starts_fork_server(self, monkeypatch):
+        """Test that in isolation mode the fork server is started instead of rendering."""
+        started = []
+        monkeypatch.setattr(warmup, "PLOT_ISOLATION", True)
+        monkeypatch.setattr(warmup, "run_isolated", lambda fn, *args: started.append(fn))
+        monkeypatch.setattr(warmup, "plot_to_bytes", None)
+        monkeypatch.setattr(warmup, "ready", threading.Event())
+
+        warmup.warm_up(RenderScheduler())
+
+        assert started == [len]
+        assert warmup.ready.is_set()
+
+    def test_failed_plot_does_not_block_readiness(self, monkeypatch):
+        """Test that the server becomes ready even when a warm-up plot fails."""
+        monkeypatch.setattr(warmup, "WARMUP_PLOTS", [("unknown", warmup._bar_data, {})])
+        monkeypatch.setattr(warmup, "ready", threading.Event())
+
+        warmup.warm_up(RenderScheduler())
+
+        assert warmup.ready.is_set()